@@ -5,6 +5,14 @@ from clapperboard.resources import api, anon_api, jwt, cors
 from clapperboard.workers import celery
 from clapperboard.tracker import tracker
 from clapperboard.mailer import mailer
+from clapperboard.cache import (
+    ref_cache,
+    imdb_cache,
+    data_version,
+    response_cache,
+    user_cache
+)
+from clapperboard.client import http_client
 
 
 def create_app():
@@ -22,6 +30,12 @@ def create_app():
     celery.init_app(app)
     tracker.init_app(app)
     mailer.init_app(app)
+    ref_cache.init_app(app)
+    imdb_cache.init_app(app)
+    data_version.init_app(app)
+    response_cache.init_app(app)
+    user_cache.init_app(app)
+    http_client.init_app(app)
 
     return app
 
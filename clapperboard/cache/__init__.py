@@ -0,0 +1,12 @@
+from clapperboard.cache.ref_cache import RefCache
+from clapperboard.cache.imdb_cache import IMDBCache
+from clapperboard.cache.data_version import DataVersionCache
+from clapperboard.cache.response_cache import ResponseCache
+from clapperboard.cache.user_cache import UserCache
+
+
+ref_cache = RefCache()
+imdb_cache = IMDBCache()
+data_version = DataVersionCache()
+response_cache = ResponseCache()
+user_cache = UserCache()
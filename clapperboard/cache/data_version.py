@@ -0,0 +1,79 @@
+import threading
+import time
+from datetime import datetime
+
+from clapperboard.models import db
+from clapperboard.models.data_version import DataVersion
+
+
+class DataVersionCache(object):
+    """
+    Version of the movie data served by the API.
+
+    The version is bumped whenever movies, showtimes or IMDB data are
+    changed and is used to tell clients whether their copy of a response
+    is still fresh. It is read from the database at most once every
+    check_interval seconds, so a change made by another process is noticed
+    with that delay.
+    """
+    app = None
+    check_interval = None
+
+    def __init__(self, app=None):
+        self._lock = threading.RLock()
+        self._checked_at = None
+        self._current = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.check_interval = app.config.get('DATA_VERSION_CHECK_INTERVAL')
+        self.app = app
+
+    def current(self):
+        """
+        :return: Tuple of current data version and the UTC datetime it was
+                 set at. Version is 0 and datetime is None if data has
+                 never been versioned.
+        """
+        with self._lock:
+            if (self._checked_at is None or
+                    time.time() - self._checked_at > self.check_interval):
+                record = DataVersion.query.get(1)
+                if record:
+                    self._current = (record.version, record.updated_at)
+                else:
+                    self._current = (0, None)
+                self._checked_at = time.time()
+            return self._current
+
+    def bump(self):
+        """
+        Increment data version. The version is incremented by a single
+        UPDATE statement, so that concurrent bumps from several processes
+        are not lost, and the row stays locked until the current session,
+        which the change is to be committed with together with the data it
+        reflects, ends.
+
+        :return: New data version
+        """
+        table = DataVersion.__table__
+        now = datetime.utcnow()
+        result = db.session.execute(
+            table.update().where(table.c.id == 1).values(
+                version=table.c.version + 1, updated_at=now
+            )
+        )
+        if not result.rowcount:
+            db.session.execute(
+                table.insert().values(id=1, version=1, updated_at=now)
+            )
+        version = db.session.query(DataVersion.version).filter(
+            DataVersion.id == 1
+        ).scalar()
+        self.invalidate()
+        return version
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = None
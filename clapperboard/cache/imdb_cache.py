@@ -0,0 +1,210 @@
+import datetime
+import json
+import logging
+from multiprocessing.pool import ThreadPool
+
+from clapperboard.models import db
+from clapperboard.models.common.utils import add_unique
+from clapperboard.models.imdb_cache_entry import IMDBCacheEntry
+from clapperboard.common import imdb_dataset
+from clapperboard.common.utils import get_movie_imdb_data, normalize_title
+
+
+log = logging.getLogger(__name__)
+
+
+class IMDBCache(object):
+    """
+    Database backed cache of IMDB lookups.
+
+    Title searches are cached by normalized title and resolve to an IMDB id,
+    or to nothing if IMDB had no match (negative entries). Movie data is
+    cached by IMDB id and is fetched again, all fields of it, once it has
+    expired.
+
+    New and refreshed entries are added to the current database session
+    and are persisted when the caller commits it.
+
+    With IMDB_RESOLVER set to 'dataset' lookups are answered from the local
+    copy of IMDB datasets instead, and are not cached.
+    """
+    app = None
+    resolver = None
+    static_ttl = None
+    negative_ttl = None
+
+    def __init__(self, app=None):
+        self.stats = dict(hits=0, misses=0)
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.static_ttl = datetime.timedelta(
+            seconds=app.config['IMDB_CACHE_STATIC_TTL']
+        )
+        self.negative_ttl = datetime.timedelta(
+            seconds=app.config['IMDB_CACHE_NEGATIVE_TTL']
+        )
+        self.resolver = app.config.get('IMDB_RESOLVER', 'scrape')
+        if self.resolver not in ('scrape', 'dataset'):
+            raise ValueError('Unknown IMDB resolver "{}"'
+                             .format(self.resolver))
+        self.app = app
+
+    def get_movie_imdb_data(self, **kwargs):
+        """
+        Cached version of clapperboard.common.utils.get_movie_imdb_data.
+
+        :param kwargs: Either title or IMDB id
+        :return: Dictionary with IMDB movie data
+        """
+        result = self._get_many([kwargs], 1)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_many_movie_imdb_data(self, queries, concurrency=1):
+        """
+        Look up IMDB data of several movies at once.
+
+        Cache is read first. Movies missing from it are then fetched from
+        IMDB by at most `concurrency` threads and stored in the cache. Only
+        the network requests are made from the threads, all database work
+        is done in the calling one.
+
+        :param queries: List of dictionaries with either title or IMDB id
+        :param concurrency: Maximum number of simultaneous IMDB lookups
+        :return: List of dictionaries with IMDB movie data in order of
+                 queries. Dictionary is empty if IMDB has no such movie and
+                 None is returned in place of lookups that failed.
+        """
+        results = self._get_many(queries, concurrency)
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                log.error('IMDB lookup {} failed: {}'.format(
+                    queries[i], result
+                ))
+                results[i] = None
+        return results
+
+    def reset_stats(self):
+        self.stats = dict(hits=0, misses=0)
+
+    def _get_many(self, queries, concurrency):
+        if self.resolver == 'dataset':
+            # Local dataset is as fast as the cache and is read in the
+            # calling thread as it needs a database session
+            return [
+                _call(imdb_dataset.get_movie_imdb_data, query)
+                for query in queries
+            ]
+
+        now = datetime.datetime.utcnow()
+        results = [None] * len(queries)
+
+        # Index of query in results by IMDB lookup it needs
+        lookups = {}
+        for i, query in enumerate(queries):
+            if 'title' in query:
+                lookup = self._lookup_title(query['title'], now)
+            elif 'id' in query:
+                lookup = self._lookup_id(query['id'], now)
+            else:
+                raise RuntimeError(
+                    "Must be called with either IMDB movie ID of movie title"
+                )
+            if isinstance(lookup, dict):
+                self.stats['hits'] += 1
+                results[i] = lookup
+            else:
+                self.stats['misses'] += 1
+                lookups.setdefault(lookup, []).append(i)
+
+        lookups = list(lookups.items())
+        fetched = _fetch_all([lookup for lookup, _ in lookups], concurrency)
+        for (lookup, indexes), movie_imdb_data in zip(lookups, fetched):
+            if not isinstance(movie_imdb_data, Exception):
+                movie_imdb_data = self._store(lookup, movie_imdb_data, now)
+            for i in indexes:
+                results[i] = movie_imdb_data
+        return results
+
+    def _lookup_title(self, title, now):
+        """
+        :return: Cached movie data or a lookup tuple to fetch it with
+        """
+        entry = IMDBCacheEntry.query.get(_title_key(title))
+        if entry:
+            ttl = self.static_ttl if entry.imdb_id else self.negative_ttl
+            if now - entry.fetched_at < ttl:
+                if entry.imdb_id is None:
+                    return {}
+                return self._lookup_id(entry.imdb_id, now)
+        return ('title', title)
+
+    def _lookup_id(self, movie_id, now):
+        """
+        :return: Cached movie data or a lookup tuple to fetch it with
+        """
+        entry = IMDBCacheEntry.query.get('id:{}'.format(movie_id))
+        if entry and now - entry.fetched_at < self.static_ttl:
+            return json.loads(entry.data)
+        return ('id', movie_id)
+
+    def _store(self, lookup, movie_imdb_data, now):
+        kind, value = lookup
+        if kind == 'title':
+            key = _title_key(value)
+            entry = IMDBCacheEntry.query.get(key)
+            movie_id = movie_imdb_data.get('id')
+            if entry is None:
+                entry = add_unique(
+                    db.session, IMDBCacheEntry(key, movie_id, None, now)
+                )
+            entry.imdb_id = movie_id
+            entry.fetched_at = now
+            if movie_imdb_data:
+                self._store_movie_data(movie_imdb_data, now)
+            return movie_imdb_data
+
+        self._store_movie_data(movie_imdb_data, now)
+        return movie_imdb_data
+
+    def _store_movie_data(self, movie_imdb_data, now):
+        key = 'id:{}'.format(movie_imdb_data['id'])
+        entry = IMDBCacheEntry.query.get(key)
+        if entry is None:
+            # Another worker may be storing the same movie at the same time
+            entry = add_unique(
+                db.session,
+                IMDBCacheEntry(key, movie_imdb_data['id'], None, now)
+            )
+        entry.data = json.dumps(movie_imdb_data)
+        entry.fetched_at = now
+
+
+def _call(resolve, query):
+    try:
+        return resolve(**query)
+    except Exception as error:
+        return error
+
+
+def _fetch_all(lookups, concurrency):
+    def fetch(lookup):
+        kind, value = lookup
+        return _call(get_movie_imdb_data, {kind: value})
+
+    concurrency = min(concurrency, len(lookups))
+    if concurrency > 1:
+        pool = ThreadPool(concurrency)
+        try:
+            return pool.map(fetch, lookups)
+        finally:
+            pool.close()
+            pool.join()
+    return [fetch(lookup) for lookup in lookups]
+
+
+def _title_key(title):
+    return 'title:{}'.format(normalize_title(title))
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event
+
+from clapperboard.models import db
+from clapperboard.models.theatre import Theatre
+from clapperboard.models.technology import Technology
+
+
+log = logging.getLogger(__name__)
+
+TheatreRecord = namedtuple(
+    'TheatreRecord', ['id', 'name', 'en_name', 'url_code', 'st_url_code']
+)
+TechnologyRecord = namedtuple('TechnologyRecord', ['id', 'code', 'name'])
+
+
+class RefCache(object):
+    """
+    In-process cache of theatres and technologies.
+
+    These tables hold a handful of rows that hardly ever change, so they are
+    read once and kept in memory. The cache is dropped whenever a theatre or
+    a technology is written through the ORM and is reloaded after ttl
+    seconds to pick up changes made by other processes.
+    """
+    app = None
+    ttl = None
+
+    def __init__(self, app=None):
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._theatres = None
+        self._technologies = None
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('REF_CACHE_TTL')
+        for model in (Theatre, Technology):
+            for name in ('after_insert', 'after_update', 'after_delete'):
+                if not event.contains(model, name, self._on_write):
+                    event.listen(model, name, self._on_write)
+        self.app = app
+
+    def load(self):
+        """
+        (Re)load theatres and technologies from the database.
+        """
+        theatres = [
+            TheatreRecord(th.id, th.name, th.en_name, th.url_code,
+                          th.st_url_code)
+            for th in Theatre.query.order_by(Theatre.id)
+        ]
+        technologies = [
+            TechnologyRecord(tech.id, tech.code, tech.name)
+            for tech in Technology.query.order_by(Technology.id)
+        ]
+        with self._lock:
+            self._theatres = theatres
+            self._technologies = technologies
+            self._loaded_at = time.time()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def theatres(self):
+        self._ensure_loaded()
+        return self._theatres
+
+    def theatre(self, theatre_id):
+        for theatre in self.theatres():
+            if theatre.id == theatre_id:
+                return theatre
+
+    def theatre_id(self, st_url_code):
+        for theatre in self.theatres():
+            if theatre.st_url_code == st_url_code:
+                return theatre.id
+        raise KeyError('Unknown theatre "{}"'.format(st_url_code))
+
+    def technologies(self):
+        self._ensure_loaded()
+        return self._technologies
+
+    def technology(self, technology_id):
+        for technology in self.technologies():
+            if technology.id == technology_id:
+                return technology
+
+    def technology_id(self, code):
+        """
+        Get id of a technology by its code, creating the technology if it
+        does not exist yet.
+
+        :param code: Technology code as found in PK data
+        :return: Technology id
+        """
+        for technology in self.technologies():
+            if technology.code == code:
+                return technology.id
+
+        log.warning('Adding new technology "{}"'.format(code))
+        technology = Technology(code=code, name=code.upper())
+        db.session.add(technology)
+        db.session.flush()
+        return technology.id
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if (self._loaded_at is None or
+                    (self.ttl and time.time() - self._loaded_at > self.ttl)):
+                self.load()
+
+    def _on_write(self, mapper, connection, target):
+        self.invalidate()
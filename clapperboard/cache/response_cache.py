@@ -0,0 +1,119 @@
+import itertools
+import logging
+import threading
+
+# Optional shared backend
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+log = logging.getLogger(__name__)
+
+
+class MemoryBackend(object):
+    """
+    In-process cache keeping at most size most recently used entries.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries[key] = (entry[0], next(self._counter))
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, next(self._counter))
+            while len(self._entries) > self.size:
+                lru_key = min(self._entries,
+                              key=lambda k: self._entries[k][1])
+                del self._entries[lru_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend(object):
+    """
+    Cache shared by all processes, kept in Redis. Entries expire after ttl
+    seconds.
+    """
+    prefix = 'clapperboard:response:'
+
+    def __init__(self, url, ttl):
+        if redis is None:
+            raise RuntimeError('redis package is required for Redis backend')
+        self.ttl = ttl
+        self._redis = redis.StrictRedis.from_url(url)
+
+    def get(self, key):
+        return self._redis.get(self.prefix + key)
+
+    def set(self, key, value):
+        self._redis.setex(self.prefix + key, self.ttl, value)
+
+    def clear(self):
+        keys = self._redis.keys(self.prefix + '*')
+        if keys:
+            self._redis.delete(*keys)
+
+
+class ResponseCache(object):
+    """
+    Cache of serialized API response bodies.
+
+    Keys are expected to contain the data version, so entries become
+    unreachable as soon as data changes and need not be dropped explicitly.
+    Disabled if RESPONSE_CACHE_BACKEND is not set.
+    """
+    app = None
+    backend = None
+
+    def __init__(self, app=None):
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND')
+        if backend == 'memory':
+            self.backend = MemoryBackend(app.config['RESPONSE_CACHE_SIZE'])
+        elif backend == 'redis':
+            self.backend = RedisBackend(
+                app.config['RESPONSE_CACHE_REDIS_URL'],
+                app.config['RESPONSE_CACHE_TTL']
+            )
+        elif backend:
+            raise ValueError('Unknown response cache backend "{}"'
+                             .format(backend))
+        self.app = app
+
+    def get(self, key):
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            log.warning('Response cache lookup failed: {}'.format(e))
+
+    def set(self, key, value):
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            log.warning('Response cache update failed: {}'.format(e))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
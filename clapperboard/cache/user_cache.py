@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import namedtuple
+
+from clapperboard.models.user import User
+
+
+CachedUser = namedtuple('CachedUser', ['id', 'username', 'is_admin'])
+
+
+class UserCache(object):
+    """
+    In-process cache of users authenticated by JWT, so that an
+    authenticated request does not have to read the user from the database.
+
+    Users are kept for ttl seconds, or until invalidated when changed.
+    """
+    app = None
+    ttl = None
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._users = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL')
+        self.app = app
+
+    def get(self, user_id):
+        """
+        :param user_id: User id
+        :return: CachedUser or None if there is no such user
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._users.get(user_id)
+        if entry and now - entry[1] <= self.ttl:
+            return entry[0]
+
+        user = User.query.get(user_id)
+        if user is None:
+            return None
+        cached_user = CachedUser(user.id, user.username, user.is_admin)
+        with self._lock:
+            # Drop expired entries so that the cache does not grow with
+            # every user ever seen
+            for expired_id in [uid for uid, (_, loaded_at)
+                               in self._users.items()
+                               if now - loaded_at > self.ttl]:
+                del self._users[expired_id]
+            self._users[user_id] = (cached_user, now)
+        return cached_user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
@@ -0,0 +1,4 @@
+from clapperboard.client.clap_client import ClapClient
+
+
+http_client = ClapClient()
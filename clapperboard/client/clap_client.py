@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import urlparse
+
+
+log = logging.getLogger(__name__)
+
+# Response statuses a request is retried on
+RETRY_STATUSES = (500, 502, 503, 504)
+# Methods of requests that are retried, i.e. those safe to send again
+RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+class ClapClient(object):
+    """
+    HTTP client all outbound requests go through.
+
+    Every host gets its own session so that connections are kept alive and
+    reused. Requests time out after a connect or read timeout and are
+    retried with exponential backoff on connection errors, timeouts and
+    server errors. Requests to a host, retries included, can be limited to
+    a number per second. Request count, error count and latency are
+    recorded per host.
+    """
+    app = None
+    connect_timeout = 5
+    read_timeout = 30
+    max_retries = 3
+    backoff_factor = 0.5
+    pool_size = 10
+    rate_limits = {}
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._next_request_at = {}
+        self.stats = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.connect_timeout = app.config['HTTP_CONNECT_TIMEOUT']
+        self.read_timeout = app.config['HTTP_READ_TIMEOUT']
+        self.max_retries = app.config['HTTP_MAX_RETRIES']
+        self.backoff_factor = app.config['HTTP_BACKOFF_FACTOR']
+        self.pool_size = app.config['HTTP_POOL_SIZE']
+        self.rate_limits = app.config['HTTP_RATE_LIMITS']
+        with self._lock:
+            self._sessions = {}
+        self.app = app
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the session of the url's host.
+
+        Requests of RETRY_METHODS are sent up to max_retries more times if
+        they fail or get one of RETRY_STATUSES, the n-th retry after
+        backoff_factor * 2 ** (n - 1) seconds. Every attempt waits for its
+        turn under the rate limit of the host.
+
+        Takes the same arguments as requests.request.
+        :raise requests.exceptions.RetryError: If the last retry got one of
+                                               RETRY_STATUSES
+        """
+        host = urlparse(url).netloc
+        session = self._get_session(host)
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        retries = self.max_retries if method.upper() in RETRY_METHODS else 0
+
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(self.backoff_factor * 2 ** (attempt - 1))
+            try:
+                resp = self._send(session, host, method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt == retries:
+                    raise
+                log.warning('{} {} failed, retrying: {}'.format(method, url,
+                                                                error))
+                continue
+            if resp.status_code not in RETRY_STATUSES or not retries:
+                return resp
+            resp.close()
+            if attempt == retries:
+                raise requests.exceptions.RetryError(
+                    '{} {} got {} after {} retries'.format(
+                        method, url, resp.status_code, retries
+                    ),
+                    response=resp
+                )
+            log.warning('{} {} got {}, retrying'.format(method, url,
+                                                        resp.status_code))
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+
+    def log_stats(self):
+        for host, stats in sorted(self.stats.items()):
+            log.info(
+                '{}: {} requests, {} errors, {:.3f}s average, '
+                '{:.3f}s max'.format(
+                    host, stats['requests'], stats['errors'],
+                    stats['total_time'] / stats['requests'],
+                    stats['max_time']
+                )
+            )
+
+    def _get_session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                # Retries are made by request() so that each of them goes
+                # through the rate limit
+                adapter = HTTPAdapter(pool_maxsize=self.pool_size)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _send(self, session, host, method, url, **kwargs):
+        self._wait_for_turn(host)
+        start = time.time()
+        try:
+            resp = session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self._record(host, time.time() - start, error=True)
+            raise
+        elapsed = time.time() - start
+        self._record(host, elapsed)
+        log.debug('{} {} {} {:.3f}s'.format(method, url, resp.status_code,
+                                            elapsed))
+        return resp
+
+    def _wait_for_turn(self, host):
+        rate_limit = self.rate_limits.get(host)
+        if not rate_limit:
+            return
+
+        # Reserve the next free slot for this host and sleep until it comes
+        with self._lock:
+            now = time.time()
+            request_at = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = request_at + 1.0 / rate_limit
+        if request_at > now:
+            time.sleep(request_at - now)
+
+    def _record(self, host, elapsed, error=False):
+        with self._lock:
+            stats = self.stats.setdefault(
+                host, dict(requests=0, errors=0, total_time=0.0, max_time=0.0)
+            )
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['total_time'] += elapsed
+            stats['max_time'] = max(stats['max_time'], elapsed)
@@ -0,0 +1,322 @@
+"""
+Local copy of IMDB datasets (https://www.imdb.com/interfaces/).
+
+import_dataset loads the TSV dumps into imdb_title, imdb_rating,
+imdb_principal and imdb_name tables, and get_movie_imdb_data answers the
+same queries as clapperboard.common.utils.get_movie_imdb_data from them.
+
+The import relies on MySQL statements to make and swap the tables it
+loads dumps into, so it requires a MySQL database.
+"""
+import datetime
+import gzip
+import io
+import logging
+import os
+import time
+
+from flask import current_app
+from sqlalchemy.sql import column, table as table_clause, text
+
+from clapperboard.models import db
+from clapperboard.models.imdb_title import IMDBTitle
+from clapperboard.models.imdb_rating import IMDBRating
+from clapperboard.models.imdb_principal import IMDBPrincipal
+from clapperboard.models.imdb_name import IMDBName
+from clapperboard.common.utils import LIST_SEPARATOR
+from clapperboard.common.title_matcher import TitleMatcher
+
+
+log = logging.getLogger(__name__)
+
+# Value of a missing field in the dumps
+NULL = '\\N'
+
+# Only titles of these types are imported
+TITLE_TYPES = ('movie', 'tvMovie')
+
+DIRECTOR_CATEGORIES = ('director',)
+CAST_CATEGORIES = ('actor', 'actress')
+
+# Number of cast members in movie data, the same as on IMDB title page
+CAST_SIZE = 10
+
+# Suffixes of the tables dumps are loaded into and of the replaced tables
+STAGING_SUFFIX = '_import'
+PREVIOUS_SUFFIX = '_previous'
+
+# Title matcher built by _title_matcher
+_matcher = dict(matcher=None, built_at=None)
+
+
+def import_dataset(directory, chunk_size):
+    """
+    Replace contents of IMDB dataset tables with the dumps found in a
+    directory.
+
+    Dumps are streamed line by line and inserted in chunks of chunk_size
+    rows, so memory use does not depend on their size, apart from the ids
+    of imported titles and of their directors and cast. These are kept to
+    skip ratings and principals of other titles and names of other people.
+    Dumps are loaded into staging tables which replace the live ones at
+    once after all of them have been loaded, so lookups never see a
+    partially imported dataset.
+
+    :param directory: Directory with title.basics, title.ratings,
+                      title.principals and name.basics dumps, either
+                      gzipped (.tsv.gz) or not (.tsv)
+    :param chunk_size: Number of rows inserted by a single statement
+    :raise RuntimeError: If the database is not MySQL
+    """
+    dialect = db.engine.dialect.name
+    if dialect != 'mysql':
+        raise RuntimeError(
+            'IMDB dataset import requires MySQL, database is {}'
+            .format(dialect)
+        )
+
+    title_ids = set()
+    name_ids = set()
+
+    def titles(row):
+        if row['titleType'] not in TITLE_TYPES:
+            return None
+        title_id = _id(row['tconst'])
+        title_ids.add(title_id)
+        return dict(
+            id=title_id,
+            title_type=row['titleType'],
+            primary_title=row['primaryTitle'],
+            original_title=row['originalTitle'],
+            start_year=_int(row['startYear']),
+            runtime=_int(row['runtimeMinutes']),
+            genres=_null(row['genres'])
+        )
+
+    def ratings(row):
+        title_id = _id(row['tconst'])
+        if title_id not in title_ids:
+            return None
+        return dict(
+            title_id=title_id,
+            rating=float(row['averageRating']),
+            votes=int(row['numVotes'])
+        )
+
+    def principals(row):
+        title_id = _id(row['tconst'])
+        if (title_id not in title_ids or row['category'] not in
+                DIRECTOR_CATEGORIES + CAST_CATEGORIES):
+            return None
+        name_id = _id(row['nconst'])
+        name_ids.add(name_id)
+        return dict(
+            title_id=title_id,
+            ordering=int(row['ordering']),
+            name_id=name_id,
+            category=row['category']
+        )
+
+    def names(row):
+        name_id = _id(row['nconst'])
+        if name_id not in name_ids:
+            return None
+        return dict(
+            id=name_id,
+            name=(_null(row['primaryName']) or '')[:255]
+        )
+
+    # Make sure all dumps are there before anything is imported
+    dumps = [
+        (_dump_path(directory, 'title.basics'), IMDBTitle, titles),
+        (_dump_path(directory, 'title.ratings'), IMDBRating, ratings),
+        (_dump_path(directory, 'title.principals'), IMDBPrincipal,
+         principals),
+        (_dump_path(directory, 'name.basics'), IMDBName, names)
+    ]
+    for path, model, convert in dumps:
+        _import_dump(path, model.__table__, convert, chunk_size)
+    _swap_tables([model.__table__ for _, model, _ in dumps])
+
+    # Titles are to be indexed again
+    _matcher.update(matcher=None, built_at=None)
+
+
+def get_movie_imdb_data(**kwargs):
+    """
+    Look up movie data in IMDB dataset tables.
+
+    Titles are matched fuzzily against the titles released in the last
+    IMDB_MATCH_YEARS years.
+
+    :param kwargs: Either title, optionally with the year the movie is
+                   shown in, or IMDB id
+    :return: Dictionary with IMDB movie data, the same as returned by
+             clapperboard.common.utils.get_movie_imdb_data
+    """
+    if 'title' in kwargs:
+        match = _title_matcher().match(kwargs['title'], kwargs.get('year'))
+        if match is None:
+            return {}
+        log.info(u'Title "{}" matched IMDB title {} "{}" ({}), '
+                 u'confidence {:.2f}'.format(kwargs['title'], match.id,
+                                             match.title, match.year,
+                                             match.confidence))
+        title = IMDBTitle.query.get(match.id)
+        if title is None:
+            # Dataset has been imported again since the matcher was built
+            log.warning('IMDB title {} not found in dataset'.format(match.id))
+            return {}
+    elif 'id' in kwargs:
+        title = IMDBTitle.query.get(kwargs['id'])
+        if title is None:
+            raise ValueError('IMDB title {} not found in dataset'
+                             .format(kwargs['id']))
+    else:
+        raise RuntimeError(
+            "Must be called with either IMDB movie ID of movie title"
+        )
+
+    rating = IMDBRating.query.get(title.id)
+    principals = db.session.query(
+        IMDBPrincipal.category, IMDBName.name
+    ).join(
+        IMDBName, IMDBName.id == IMDBPrincipal.name_id
+    ).filter(
+        IMDBPrincipal.title_id == title.id
+    ).order_by(IMDBPrincipal.ordering).all()
+
+    return dict(
+        id=title.id,
+        title=title.primary_title,
+        rating=rating.rating if rating else None,
+        genre=LIST_SEPARATOR.join((title.genres or '').split(',')),
+        # Country of origin is not a part of the datasets
+        country='',
+        director=LIST_SEPARATOR.join(
+            name for category, name in principals
+            if category in DIRECTOR_CATEGORIES
+        ),
+        cast=LIST_SEPARATOR.join([
+            name for category, name in principals
+            if category in CAST_CATEGORIES
+        ][:CAST_SIZE]),
+        runtime=title.runtime
+    )
+
+
+def _title_matcher():
+    """
+    Get TitleMatcher of recent titles, building it if it is older than
+    IMDB_MATCHER_TTL.
+    """
+    now = time.time()
+    ttl = current_app.config['IMDB_MATCHER_TTL']
+    if _matcher['built_at'] is None or now - _matcher['built_at'] > ttl:
+        since_year = (datetime.date.today().year -
+                      current_app.config['IMDB_MATCH_YEARS'])
+        candidates = db.session.query(
+            IMDBTitle.id, IMDBTitle.primary_title, IMDBTitle.start_year,
+            IMDBRating.votes
+        ).outerjoin(
+            IMDBRating, IMDBRating.title_id == IMDBTitle.id
+        ).filter(
+            IMDBTitle.start_year >= since_year
+        )
+        _matcher['matcher'] = TitleMatcher(
+            candidates, current_app.config['IMDB_MATCH_MIN_CONFIDENCE']
+        )
+        _matcher['built_at'] = now
+        log.info('Indexed {} IMDB titles released since {}'.format(
+            len(_matcher['matcher']), since_year
+        ))
+    return _matcher['matcher']
+
+
+def _import_dump(path, table, convert, chunk_size):
+    staging_name = table.name + STAGING_SUFFIX
+    log.info('Importing {} into {}'.format(path, staging_name))
+    db.session.execute(text('DROP TABLE IF EXISTS {}'.format(staging_name)))
+    db.session.execute(text('CREATE TABLE {} LIKE {}'.format(
+        staging_name, table.name
+    )))
+    staging = table_clause(
+        staging_name, *[column(c.name) for c in table.columns]
+    )
+
+    imported = 0
+    chunk = []
+    for row in _read_dump(path):
+        values = convert(row)
+        if values is None:
+            continue
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            db.session.execute(staging.insert(), chunk)
+            imported += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(staging.insert(), chunk)
+        imported += len(chunk)
+
+    db.session.commit()
+    log.info('Imported {} rows into {}'.format(imported, staging_name))
+
+
+def _swap_tables(tables):
+    """
+    Replace tables with their staging copies.
+
+    MySQL renames all tables of a single RENAME TABLE statement atomically,
+    so readers see either the previous or the new contents of all tables.
+    """
+    names = [t.name for t in tables]
+    previous = ', '.join(name + PREVIOUS_SUFFIX for name in names)
+    db.session.execute(text('DROP TABLE IF EXISTS {}'.format(previous)))
+    db.session.execute(text('RENAME TABLE {}'.format(', '.join(
+        '{0} TO {0}{1}, {0}{2} TO {0}'.format(
+            name, PREVIOUS_SUFFIX, STAGING_SUFFIX
+        ) for name in names
+    ))))
+    db.session.execute(text('DROP TABLE {}'.format(previous)))
+    db.session.commit()
+    log.info('Replaced {}'.format(', '.join(names)))
+
+
+def _read_dump(path):
+    """
+    Iterate over rows of a dump as dictionaries keyed by column names.
+    """
+    if path.endswith('.gz'):
+        raw_file = gzip.open(path, 'rb')
+    else:
+        raw_file = io.open(path, 'rb')
+    # Lines are split on \n only, titles may contain other line breaks
+    dump = io.TextIOWrapper(raw_file, encoding='utf-8', newline='\n')
+    try:
+        columns = dump.readline().rstrip('\n').split('\t')
+        for line in dump:
+            yield dict(zip(columns, line.rstrip('\n').split('\t')))
+    finally:
+        raw_file.close()
+
+
+def _dump_path(directory, name):
+    for file_name in ('{}.tsv.gz'.format(name), '{}.tsv'.format(name)):
+        path = os.path.join(directory, file_name)
+        if os.path.exists(path):
+            return path
+    raise RuntimeError('No {} dump found in {}'.format(name, directory))
+
+
+def _id(const):
+    # tt0000001, nm0000001
+    return int(const[2:])
+
+
+def _int(value):
+    return None if value == NULL else int(value)
+
+
+def _null(value):
+    return None if value == NULL else value
@@ -0,0 +1,104 @@
+"""
+Extraction of movie data from IMDB pages.
+
+XPath expressions are compiled once at import time. On a movie page the
+blocks holding the data are located first and the fields are then looked
+up within them, rather than each field being searched for in the whole
+document.
+"""
+import re
+from collections import namedtuple
+
+from lxml import etree
+from lxml import html as lh
+
+
+IMDBRecord = namedtuple(
+    'IMDBRecord',
+    ['id', 'title', 'rating', 'genres', 'countries', 'directors', 'cast',
+     'runtime']
+)
+
+# Movie search page (/find)
+SEARCH_RESULT_LINK = etree.XPath(
+    "//div[@class='findSection']/table[@class='findList']"
+    "/tr[starts-with(@class, 'findResult')][1]/td[@class='result_text']"
+    "/a/@href"
+)
+MOVIE_LINK_PATTERN = re.compile(r'^/title/tt(\d+)/\?ref_=fn_ft_tt_1$')
+
+# Movie page (/title/tt<id>) blocks
+OVERVIEW = etree.XPath("//td[@id='overview-top']")
+STORYLINE = etree.XPath("//div[@id='titleStoryLine']")
+CAST_LIST = etree.XPath("//table[@class='cast_list']")
+DETAILS = etree.XPath("//div[@id='titleDetails']")
+
+# Fields, relative to their blocks
+TITLE = etree.XPath("h1/span[@itemprop='name']/text()")
+RATING = etree.XPath(
+    ".//div[@class='titlePageSprite star-box-giga-star']/text()"
+)
+DIRECTORS = etree.XPath(".//div[@itemprop='director']/a/span/text()")
+GENRES = etree.XPath(".//div[@itemprop='genre']/a/text()")
+CAST = etree.XPath(
+    "tr[position() >= 2 and position() <= 11]"
+    "/td[@itemtype='http://schema.org/Person']/a/span/text()"
+)
+RUNTIME = etree.XPath("div/time/text()")
+COUNTRIES = etree.XPath("div/h4[text()='Country:']/../a/text()")
+
+
+def extract_movie_id(html):
+    """
+    Get IMDB id of the first movie on a search results page.
+
+    :param html: Search results page
+    :return: IMDB id or None if nothing has been found
+    """
+    links = SEARCH_RESULT_LINK(lh.fromstring(html))
+    if not links:
+        return None
+    return int(MOVIE_LINK_PATTERN.match(links[0]).group(1))
+
+
+def extract_movie(html, movie_id):
+    """
+    Get movie data from its IMDB page.
+
+    :param html: Movie page
+    :param movie_id: IMDB id of the movie
+    :return: IMDBRecord
+    """
+    doc = lh.fromstring(html)
+    overview = _block(OVERVIEW, doc)
+    storyline = _block(STORYLINE, doc)
+    cast_list = _block(CAST_LIST, doc)
+    details = _block(DETAILS, doc)
+
+    # Title is the only mandatory field
+    titles = TITLE(overview) if overview is not None else []
+    if not titles:
+        raise ValueError('No title found on IMDB page of movie {}'
+                         .format(movie_id))
+
+    # Rating, directors and genres are searched for in the whole document
+    # if their blocks are missing
+    rating = RATING(doc if overview is None else overview)
+    runtime = RUNTIME(details) if details is not None else []
+
+    return IMDBRecord(
+        id=movie_id,
+        title=titles[0],
+        rating=float(rating[0].strip()) if rating else None,
+        genres=[g.strip() for g in
+                GENRES(doc if storyline is None else storyline)],
+        countries=COUNTRIES(details) if details is not None else [],
+        directors=DIRECTORS(doc if overview is None else overview),
+        cast=CAST(cast_list) if cast_list is not None else [],
+        runtime=int(runtime[0].split(' ')[0]) if runtime else None
+    )
+
+
+def _block(xpath, doc):
+    found = xpath(doc)
+    return found[0] if found else None
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import re
+import unicodedata
+from collections import Counter, defaultdict, namedtuple
+
+
+TitleMatch = namedtuple('TitleMatch', ['id', 'title', 'year', 'confidence'])
+
+# Ukrainian and Russian letters, so that titles in Cyrillic can be matched
+# with their transliterations
+TRANSLITERATION = dict((ord(k), v) for k, v in {
+    u'а': 'a', u'б': 'b', u'в': 'v', u'г': 'h', u'ґ': 'g', u'д': 'd',
+    u'е': 'e', u'є': 'ye', u'ё': 'yo', u'ж': 'zh', u'з': 'z', u'и': 'y',
+    u'і': 'i', u'ї': 'yi', u'й': 'y', u'к': 'k', u'л': 'l', u'м': 'm',
+    u'н': 'n', u'о': 'o', u'п': 'p', u'р': 'r', u'с': 's', u'т': 't',
+    u'у': 'u', u'ф': 'f', u'х': 'kh', u'ц': 'ts', u'ч': 'ch', u'ш': 'sh',
+    u'щ': 'shch', u'ъ': '', u'ы': 'y', u'ь': '', u'э': 'e', u'ю': 'yu',
+    u'я': 'ya'
+}.items())
+
+ARTICLES = ('the', 'a', 'an')
+
+# Trigrams found in more than this share of candidate titles are not used
+# to find candidates, only to score them
+COMMON_TRIGRAM_SHARE = 0.02
+
+# Number of candidates scored for each title
+MAX_CANDIDATES = 50
+
+MIN_CONFIDENCE = 0.6
+
+
+def normalize(title):
+    """
+    Bring a title to the form titles are compared in: lowercase,
+    transliterated to ASCII, with punctuation, leading article and "and"
+    removed.
+
+    :param title: Movie title
+    :return: Normalized title
+    """
+    title = title.lower().replace(u'&', u' and ').translate(TRANSLITERATION)
+    title = u''.join(
+        c for c in unicodedata.normalize('NFKD', title)
+        if not unicodedata.combining(c)
+    )
+    words = re.sub(r'[\W_]+', ' ', title, flags=re.UNICODE).split()
+    if words and words[0] in ARTICLES:
+        words = words[1:]
+    return ' '.join(word for word in words if word != 'and')
+
+
+def trigrams(normalized_title):
+    """
+    :param normalized_title: Title returned by normalize
+    :return: Set of character trigrams of the title padded with spaces
+    """
+    padded = u'  {} '.format(normalized_title)
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TitleMatcher(object):
+    """
+    Fuzzy matcher of movie titles against a set of candidate titles.
+
+    Candidate titles are indexed by their trigrams. A title is matched by
+    looking up candidates sharing the most trigrams with it, and scoring
+    them by trigram similarity (Dice coefficient) adjusted for the
+    difference between the year the movie is shown and the candidate's
+    release year. Candidates with equal scores are told apart by the
+    number of votes on IMDB.
+    """
+
+    def __init__(self, candidates, min_confidence=MIN_CONFIDENCE):
+        """
+        :param candidates: Iterable of tuples (id, title, year, votes)
+        :param min_confidence: Minimal confidence of a match
+        """
+        self.min_confidence = min_confidence
+        self._candidates = []
+        self._index = defaultdict(list)
+        for candidate_id, title, year, votes in candidates:
+            normalized = normalize(title)
+            if not normalized:
+                continue
+            grams = frozenset(trigrams(normalized))
+            i = len(self._candidates)
+            self._candidates.append(
+                (candidate_id, title, year, votes or 0, grams)
+            )
+            for gram in grams:
+                self._index[gram].append(i)
+        self._max_postings = max(
+            MAX_CANDIDATES,
+            int(len(self._candidates) * COMMON_TRIGRAM_SHARE)
+        )
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def match(self, title, year=None):
+        """
+        Find the candidate best matching a title.
+
+        :param title: Movie title
+        :param year: Year the movie is shown in, if known
+        :return: TitleMatch or None if no candidate is similar enough
+        """
+        normalized = normalize(title)
+        if not normalized:
+            return None
+        grams = trigrams(normalized)
+
+        postings = [self._index[g] for g in grams if g in self._index]
+        selective = [
+            p for p in postings if len(p) <= self._max_postings
+        ] or postings
+        shared = Counter()
+        for posting in selective:
+            shared.update(posting)
+
+        best, best_key = None, None
+        for i, _ in shared.most_common(MAX_CANDIDATES):
+            candidate_id, candidate_title, candidate_year, votes, \
+                candidate_grams = self._candidates[i]
+            similarity = (2.0 * len(grams & candidate_grams) /
+                          (len(grams) + len(candidate_grams)))
+            confidence = similarity * _year_factor(year, candidate_year)
+            key = (confidence, votes)
+            if best_key is None or key > best_key:
+                best_key = key
+                best = TitleMatch(candidate_id, candidate_title,
+                                  candidate_year, confidence)
+
+        if best is None or best.confidence < self.min_confidence:
+            return None
+        return best
+
+
+def _year_factor(year, candidate_year):
+    if year is None:
+        return 1.0
+    if candidate_year is None:
+        return 0.9
+    # Movies are usually shown in the year they are released in or the
+    # year after
+    diff = year - candidate_year
+    if 0 <= diff <= 1:
+        return 1.0
+    if -1 <= diff <= 2:
+        return 0.85
+    return 0.6
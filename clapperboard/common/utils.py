@@ -1,12 +1,16 @@
+import calendar
 import datetime
 import logging
 import re
-from email.utils import parsedate_tz, mktime_tz
+from email.utils import parsedate_tz, mktime_tz, formatdate
+from multiprocessing.pool import ThreadPool
 
 import pytz
 import requests
-import xmltodict
-from lxml import html as lh
+from lxml import etree
+
+from clapperboard.client import http_client
+from clapperboard.common.imdb_extractor import extract_movie, extract_movie_id
 
 
 logging.getLogger('requests').setLevel(logging.WARNING)
@@ -14,17 +18,95 @@ log = logging.getLogger(__name__)
 
 LIST_SEPARATOR = ', '
 
+# Timezone of the date/time values in PK data
+LOCAL_TIMEZONE = 'Europe/Kiev'
+
+FETCH_UPDATED = 'updated'
+FETCH_UNCHANGED = 'unchanged'
+FETCH_FAILED = 'failed'
+
+PK_MOVIE = 'movie'
+PK_SHOWTIME = 'showtime'
+
+PK_SHOWTIMES_URL = 'http://planeta-kino.com.ua/{}/showtimes/xml/'
+IMDB_URL = 'http://www.imdb.com'
+
+ORDER_URL_PATTERN = re.compile(
+    "^https:\/\/cabinet.planeta-kino.com.ua\/hall\/\?show_id=(\d+)&.*$"
+)
 
-def get_pk_data(theatres, force):
+
+def get_pk_data(theatres, force, concurrency=1):
     """
     Get movies and showtimes data from PK website.
 
-    :param: theatres: List of dictionaries with theatre url codes
-                      and last fetched times
+    Theatres are fetched by a pool of at most `concurrency` worker threads.
+    Results are merged in the order of `theatres` regardless of which
+    request finishes first, so the output is the same as for a serial run.
+
+    Each theatre dictionary gets a status: FETCH_UPDATED if its data has
+    been processed, FETCH_UNCHANGED if it has not changed since the last
+    fetch and FETCH_FAILED if it could not be fetched or parsed. Data of
+    failed theatres is left out of the result.
+
+    :param: theatres: List of dictionaries with theatre url codes,
+                      last fetched times and ETags
     :param: force: Forcefully get all data regardless of Last-Modified
                    header value
+    :param: concurrency: Maximum number of theatres fetched simultaneously
     :return: Tuple of lists (movies, showtimes, theatres)
     """
+    movies = []
+    showtimes = []
+    seen_movies = set()
+
+    def fetch(theatre):
+        # A failing theatre must not prevent other theatres from updating
+        try:
+            return _get_theatre_data(theatre, force)
+        except Exception as error:
+            log.error("Could not fetch data for {}: {}".format(
+                theatre['en_name'], error
+            ))
+            theatre['status'] = FETCH_FAILED
+            return [], []
+
+    concurrency = min(concurrency, len(theatres))
+    if concurrency > 1:
+        pool = ThreadPool(concurrency)
+        try:
+            results = pool.map(fetch, theatres)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [fetch(theatre) for theatre in theatres]
+
+    for theatre_movies, theatre_showtimes in results:
+        for movie in theatre_movies:
+            if movie['id'] not in seen_movies:
+                movies.append(movie)
+                seen_movies.add(movie['id'])
+        showtimes.extend(theatre_showtimes)
+
+    return movies, showtimes, theatres
+
+
+def _get_theatre_data(theatre, force):
+    """
+    Get movies and showtimes data of a single theatre from PK website.
+
+    Sets theatre's last fetched time and ETag to the values of
+    Last-Modified and ETag headers of the response if the data has been
+    processed. Unless forced, the request is conditional on those values so
+    that an unchanged document is not transferred at all.
+
+    :param: theatre: Dictionary with theatre url code, last fetched time
+                     and ETag
+    :param: force: Forcefully get data regardless of Last-Modified
+                   header value
+    :return: Tuple of lists (movies, showtimes)
+    """
 
     # Make the server think we are in neither of its known locations
     # (actually a bug on PK)
@@ -32,87 +114,103 @@ def get_pk_data(theatres, force):
 
     movies = []
     showtimes = []
-    seen_movies = set()
 
-    order_url_pattern = (
-        "^https:\/\/cabinet.planeta-kino.com.ua\/hall\/\?show_id=(\d+)&.*$"
+    url = PK_SHOWTIMES_URL.format(theatre['url_code'])
+    # Let the server tell us the data has not changed since the last run
+    # instead of sending the whole document
+    headers = {}
+    if not force:
+        if theatre['last_fetched']:
+            headers['If-Modified-Since'] = _utc_datetime_to_rfc822_string(
+                theatre['last_fetched']
+            )
+        if theatre['etag']:
+            headers['If-None-Match'] = theatre['etag']
+
+    log.info("Getting data for {}".format(theatre['en_name']))
+    resp = http_client.get(url, cookies=cookies, headers=headers,
+                           stream=True)
+
+    if resp.status_code == 304:
+        log.info("Data for {} has not changed".format(theatre['en_name']))
+        resp.close()
+        theatre['status'] = FETCH_UNCHANGED
+        return movies, showtimes
+
+    resp.raise_for_status()
+    last_modified = _rfc822_string_to_utc_datetime(
+        resp.headers['Last-Modified']
     )
 
-    for theatre in theatres:
-        url = (
-            "http://planeta-kino.com.ua/{}/showtimes/xml/".format(
-                theatre['url_code']
-            )
-        )
-        try:
-            log.info("Getting data for {}".format(theatre['en_name']))
-            resp = requests.get(url, cookies=cookies)
-        except requests.RequestException as error:
-            log.error(error)
-            # TODO: a temporary workaround for
-            # https://github.com/Ch00k/clapperboard/issues/4
-            raise RuntimeError(
-                error,
-                "Could not fetch data for {}. Skipping the whole run".format(
-                    theatre['en_name'])
-            )
+    if not force:
+        if (theatre['last_fetched'] and
+                theatre['last_fetched'] >= last_modified):
+            resp.close()
+            theatre['status'] = FETCH_UNCHANGED
+            return movies, showtimes
 
-        last_modified = _rfc822_string_to_utc_datetime(
-            resp.headers['Last-Modified']
-        )
+    # Parse the document as it is being downloaded
+    resp.raw.decode_content = True
+    try:
+        for record_type, record in iter_pk_records(resp.raw):
+            if record_type == PK_MOVIE:
+                movies.append(record)
+            else:
+                showtimes.append(record)
+    finally:
+        resp.close()
+
+    theatre['last_fetched'] = last_modified
+    theatre['etag'] = resp.headers.get('ETag')
+    theatre['status'] = FETCH_UPDATED
+
+    return movies, showtimes
 
-        if not force:
-            if (theatre['last_fetched'] and
-                    theatre['last_fetched'] >= last_modified):
-                continue
-
-        xml_data = resp.text
-        data_dict = xmltodict.parse(xml_data, dict_constructor=dict)
-        location_data = data_dict['planeta-kino']
-        movies_data = location_data['movies']['movie']
-        showtimes_data = location_data['showtimes']['day']
-
-        # TODO: There must be an option to avoid this in xmltodict
-        if not isinstance(showtimes_data, list):
-            showtimes_data = [showtimes_data]
-
-        for pk_movie in movies_data:
-            if pk_movie['@id'] not in seen_movies:
-                movie = dict(
-                    id=int(pk_movie['@id']),
-                    title=pk_movie['title'],
-                    url_code=pk_movie['@url'].split('/')[-2],
-                    show_start=_string_to_utc_datetime(pk_movie['dt-start']),
-                    show_end=_string_to_utc_datetime(pk_movie['dt-end'])
+
+def iter_pk_records(source):
+    """
+    Incrementally parse PK showtimes XML document.
+
+    Records are yielded as soon as the corresponding element has been
+    parsed, and processed elements are dropped from the tree, so memory
+    usage does not depend on the size of the document.
+
+    :param source: Filename or file-like object with XML data
+    :return: Generator of tuples (record type, record dictionary) where
+             record type is either PK_MOVIE or PK_SHOWTIME
+    """
+    context = etree.iterparse(source, events=('end',),
+                              tag=('movie', 'show', 'day'))
+    for _, elem in context:
+        if elem.tag == 'movie':
+            yield PK_MOVIE, dict(
+                id=int(elem.get('id')),
+                title=_element_text(elem, 'title'),
+                url_code=elem.get('url').split('/')[-2],
+                show_start=_string_to_utc_datetime(
+                    _element_text(elem, 'dt-start')
+                ),
+                show_end=_string_to_utc_datetime(
+                    _element_text(elem, 'dt-end')
                 )
-                movies.append(movie)
-                seen_movies.add(pk_movie['@id'])
-
-        for day in showtimes_data:
-            if 'show' not in day:
-                continue
-            # TODO: There must be an option to avoid this in xmltodict
-            if not isinstance(day['show'], list):
-                day['show'] = [day['show']]
-            for pk_showtime in day['show']:
-                if pk_showtime['@order-url']:
-                    showtime = dict(
-                        id=int(re.match(order_url_pattern,
-                                        pk_showtime['@order-url']).group(1)),
-                        theatre=pk_showtime['@theatre-id'],
-                        hall_id=int(pk_showtime['@hall-id']),
-                        technology=pk_showtime['@technology'],
-                        date_time=_string_to_utc_datetime(
-                            pk_showtime['@full-date']
-                        ),
-                        order_url=pk_showtime['@order-url'],
-                        movie_id=int(pk_showtime['@movie-id'])
-                    )
-                    showtimes.append(showtime)
-
-        theatre['last_fetched'] = last_modified
+            )
+        elif elem.tag == 'show' and elem.get('order-url'):
+            yield PK_SHOWTIME, dict(
+                id=int(ORDER_URL_PATTERN.match(elem.get('order-url'))
+                       .group(1)),
+                theatre=elem.get('theatre-id'),
+                hall_id=int(elem.get('hall-id')),
+                technology=elem.get('technology'),
+                date_time=_string_to_utc_datetime(elem.get('full-date')),
+                order_url=elem.get('order-url'),
+                movie_id=int(elem.get('movie-id'))
+            )
 
-    return movies, showtimes, theatres
+        # Free the element along with its already processed siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    del context
 
 
 def get_movie_imdb_data(**kwargs):
@@ -121,36 +219,14 @@ def get_movie_imdb_data(**kwargs):
     :param kwargs: Either title or IMDB id
     :return: Dictionary with IMDB movie data
     """
-    # XPath selectors on movie search page (/find)
-    link_xpath = (
-        "//div[@class='findSection']/table[@class='findList']"
-        "/tr[starts-with(@class, 'findResult')][1]/td[@class='result_text']"
-        "/a/@href"
-    )
-
-    # XPath selectors on movie page (/title/tt<id>)
-    title_xpath = "//td[@id='overview-top']/h1/span[@itemprop='name']/text()"
-    rating_xpath = "//div[@class='titlePageSprite star-box-giga-star']/text()"
-    genre_xpath = "//div[@itemprop='genre']/a/text()"
-    director_xpath = "//div[@itemprop='director']/a/span/text()"
-    cast_xpath = (
-        "//table[@class='cast_list']/tr[position() >= 2 and position() <= 11]"
-        "/td[@itemtype='http://schema.org/Person']/a/span/text()"
-    )
-    movie_details_box = "//div[@id='titleDetails']/div"
-    runtime_xpath = "{}/time/text()".format(movie_details_box)
-    country_xpath = "{}/h4[text()='Country:']/../a/text()".format(
-        movie_details_box
-    )
-
-    base_url = "http://www.imdb.com"
+    base_url = IMDB_URL
     movie_url = "{}/title/tt{}"
     search_query_string = "find?q={}&&s=tt&&ttype=ft"
     headers = {'Accept-Language': 'en-US,en'}
 
     if 'title' in kwargs:
         try:
-            search_results = requests.get(
+            search_results = http_client.get(
                 "{}/{}".format(
                     base_url,
                     search_query_string.format(kwargs['title'])
@@ -165,17 +241,10 @@ def get_movie_imdb_data(**kwargs):
                  .format(kwargs['title']))
             )
 
-        lh_doc = lh.fromstring(search_results.text)
-        movie_link = lh_doc.xpath(link_xpath)
-        if movie_link:
-            movie_link = movie_link[0]
-        else:
+        movie_id = extract_movie_id(search_results.text)
+        if movie_id is None:
             return {}
 
-        pattern = "^\/title\/tt(\d+)\/\?ref_=fn_ft_tt_1$"
-        movie_id = re.match(pattern, movie_link).group(1)
-        movie_id = int(movie_id)
-
     elif 'id' in kwargs:
         movie_id = kwargs['id']
     else:
@@ -184,7 +253,7 @@ def get_movie_imdb_data(**kwargs):
         )
 
     try:
-        movie_page = requests.get(
+        movie_page = http_client.get(
             movie_url.format(base_url, movie_id),
             headers=headers
         )
@@ -195,38 +264,51 @@ def get_movie_imdb_data(**kwargs):
             "Could not get IMDB page for movie '{}'".format(movie_id)
         )
 
-    lh_doc = lh.fromstring(movie_page.text)
-
-    # Get all IMDB data
-    title = lh_doc.xpath(title_xpath)
-    rating = lh_doc.xpath(rating_xpath)
-    genre = lh_doc.xpath(genre_xpath)
-    director = lh_doc.xpath(director_xpath)
-    cast = lh_doc.xpath(cast_xpath)
-    country = lh_doc.xpath(country_xpath)
-    runtime = lh_doc.xpath(runtime_xpath)
-
-    # Normalize
-    title = title[0]
-    rating = float(rating[0].strip()) if rating else None
-    genre = LIST_SEPARATOR.join([g.strip() for g in genre])
-    director = LIST_SEPARATOR.join(director)
-    cast = LIST_SEPARATOR.join(cast)
-    country = LIST_SEPARATOR.join(country)
-    runtime = int(runtime[0].split(' ')[0]) if runtime else None
-
+    record = extract_movie(movie_page.text, movie_id)
     return dict(
-        id=movie_id,
-        title=title,
-        rating=rating,
-        genre=genre,
-        country=country,
-        director=director,
-        cast=cast,
-        runtime=runtime
+        id=record.id,
+        title=record.title,
+        rating=record.rating,
+        genre=LIST_SEPARATOR.join(record.genres),
+        country=LIST_SEPARATOR.join(record.countries),
+        director=LIST_SEPARATOR.join(record.directors),
+        cast=LIST_SEPARATOR.join(record.cast),
+        runtime=record.runtime
     )
 
 
+def normalize_title(title):
+    """
+    Normalize movie title for comparison: lowercase it and collapse
+    whitespace.
+    """
+    return re.sub(r'\s+', ' ', title.strip().lower())
+
+
+def local_to_utc_datetime(local_dt):
+    """
+    Convert PK local datetime object to UTC datetime object (both without
+    tzinfo)
+
+    :param local_dt: datetime object in PK local time
+    :return: datetime object
+    """
+    local_tz = pytz.timezone(LOCAL_TIMEZONE)
+    return pytz.UTC.normalize(local_tz.localize(local_dt)).replace(tzinfo=None)
+
+
+def utc_to_local_datetime(utc_dt):
+    """
+    Convert UTC datetime object to PK local datetime object (both without
+    tzinfo)
+
+    :param utc_dt: datetime object in UTC
+    :return: datetime object
+    """
+    local_tz = pytz.timezone(LOCAL_TIMEZONE)
+    return pytz.UTC.localize(utc_dt).astimezone(local_tz).replace(tzinfo=None)
+
+
 def _string_to_utc_datetime(dt_string):
     """
     Convert date/time string representation to UTC datetime object
@@ -240,10 +322,7 @@ def _string_to_utc_datetime(dt_string):
         if ':' in dt_string:
             local_dt = datetime.datetime.strptime(dt_string,
                                                   '%Y-%m-%d %H:%M:%S')
-            local_tz = pytz.timezone('Europe/Kiev')
-            utc_tz = pytz.UTC
-            return (utc_tz.normalize(local_tz.localize(local_dt))
-                    .replace(tzinfo=None))
+            return local_to_utc_datetime(local_dt)
         else:
             return datetime.datetime.strptime(dt_string, '%Y-%m-%d').date()
     else:
@@ -264,21 +343,26 @@ def _rfc822_string_to_utc_datetime(rfc822_string):
     ).replace(tzinfo=None)
 
 
-def _titles_match(pk_title, imdb_title):
+def _element_text(elem, tag):
     """
-    Try to find a match between a PK title and an IMDB title.
+    Get stripped text of a child element.
 
-    First triy a simple string equality, then add a 'the' to PK title,
-    then remove 'the' from pk_title if it exists, then remove all 'and'
-    occurrences from PK title.
+    :param elem: Parent element
+    :param tag: Tag of the child element
+    :return: Text of the child element or None if it is missing or empty
+    """
+    text = elem.findtext(tag)
+    if text:
+        text = text.strip()
+    return text or None
 
-    :param pk_title: Title retrieved from PK movie URL
-    :param imdb_title: Title of the movie found on IMDB
-    :return: True if titles match, False otherwise
+
+def _utc_datetime_to_rfc822_string(utc_datetime):
     """
-    return (
-        (pk_title == imdb_title) or
-        ('the' + pk_title == imdb_title) or
-        (pk_title.startswith('the') and pk_title[3:] == imdb_title) or
-        (pk_title.replace('and', '') == imdb_title)
-    )
+    Convert UTC datetime object (without tzinfo) to RFC 822 date/time string
+    representation
+
+    :param utc_datetime: datetime object
+    :return: Date/time string in RFC822 format
+    """
+    return formatdate(calendar.timegm(utc_datetime.timetuple()), usegmt=True)
@@ -14,6 +14,11 @@ AUTH_TOKEN = '123qwe'
 SECRET_KEY = '123qwe'
 JWT_EXPIRATION_DELTA = 43200
 JWT_LEEWAY = 60
+# Take user id, username and admin flag from the token instead of the
+# database. Changes to a user take effect when they get a new token
+JWT_USER_FROM_CLAIMS = False
+# Seconds authenticated users are cached in memory for
+USER_CACHE_TTL = 60
 
 EMAIL_V10N_SECRET_KEY = '123qwe'
 EMAIL_V10N_SALT = '123qwe'
@@ -22,7 +27,82 @@ EMAIL_V10N_MAX_AGE = 43200  # 12 hours
 DEBUG = True
 SQLALCHEMY_ECHO = False
 
-RELY_ON_LAST_MODIFIED = False
+# Number of items in a page of a list API response
+API_DEFAULT_PAGE_SIZE = 500
+API_MAX_PAGE_SIZE = 1000
+# Maximum number of showtimes embedded into a page of movies by
+# expand=showtimes
+API_MAX_EXPANDED_SHOWTIMES = 1000
+
+# Compress API responses larger than COMPRESS_MIN_SIZE bytes with gzip
+# (or brotli if installed)
+COMPRESS_RESPONSES = False
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+
+# Seconds theatres and technologies are cached in memory for
+REF_CACHE_TTL = 300
+
+# Seconds the version of API data is cached in memory for, i.e. the delay
+# before a web process notices data changed by a worker
+DATA_VERSION_CHECK_INTERVAL = 10
+
+# Seconds clients and proxies may reuse a read API response for
+HTTP_CACHE_MAX_AGE = 60
+
+# Seconds current time is rounded down to in queries relative to it, e.g.
+# starting_within_days, i.e. how long their responses stay the same
+RELATIVE_TIME_STEP = 60
+# Maximum number of days starting_within_days accepts
+API_MAX_DAYS = 365
+
+# Cache serialized list API responses in memory of each process ('memory')
+# or in Redis ('redis'). Disabled if None
+RESPONSE_CACHE_BACKEND = 'memory'
+# Maximum number of responses kept by memory backend
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_REDIS_URL = 'redis://localhost:6379/0'
+# Seconds responses are kept by Redis backend
+RESPONSE_CACHE_TTL = 3600
+
+# Seconds cached IMDB lookups are considered fresh for. Movie data is
+# fetched again, all fields of it, once it expires
+IMDB_CACHE_STATIC_TTL = 604800  # 7 days
+IMDB_CACHE_NEGATIVE_TTL = 86400  # 1 day
+
+# Number of movies handled by a single enrich_imdb_data task
+IMDB_ENRICH_BATCH_SIZE = 10
+# Maximum number of simultaneous IMDB lookups of an enrich_imdb_data task.
+# Request rate is further limited by HTTP_RATE_LIMITS
+IMDB_FETCH_CONCURRENCY = 4
+
+# Where IMDB data comes from: 'scrape' for imdb.com, or 'dataset' for the
+# local copy of IMDB datasets loaded with `cb_manage imdb-import`, which
+# requires MySQL
+IMDB_RESOLVER = 'scrape'
+# Number of rows inserted by a single statement during the import
+IMDB_IMPORT_CHUNK_SIZE = 10000
+# Titles are matched against titles released in this many last years
+IMDB_MATCH_YEARS = 3
+# Minimal confidence (0 to 1) of a title match
+IMDB_MATCH_MIN_CONFIDENCE = 0.6
+# Seconds the index of titles is rebuilt after
+IMDB_MATCHER_TTL = 86400
+
+# Outbound HTTP requests
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 30
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_POOL_SIZE = 10
+# Maximum number of requests per second to a host. Limits apply to each
+# process separately, so the IMDB worker is to be run as a single process
+# (-c 1) and gets its concurrency from IMDB_FETCH_CONCURRENCY threads
+HTTP_RATE_LIMITS = {
+    'www.imdb.com': 2
+}
+
+RELY_ON_LAST_MODIFIED = True
 
 BROKER_URL = 'amqp://'
 CELERY_RESULT_BACKEND = 'amqp://'
@@ -37,6 +117,13 @@ CELERY_IMPORTS = ['clapperboard.workers.tasks']
 CELERY_TASK_RESULT_EXPIRES = 3600
 
 PK_FETCH_FREQUENCY_MINUTES = 30
+# Number of theatres fetched simultaneously (1 fetches them one by one)
+PK_FETCH_CONCURRENCY = 4
+# Theatres that failed to be fetched are retried up to this many times,
+# the first retry after PK_FETCH_RETRY_BACKOFF seconds, each next one after
+# twice as long as the previous one
+PK_FETCH_MAX_RETRIES = 3
+PK_FETCH_RETRY_BACKOFF = 60
 CELERYBEAT_SCHEDULE = {
     'pk_fetch_periodic': {
         'task': 'clapperboard.workers.tasks.write_movie_data',
@@ -55,6 +142,11 @@ CELERY_QUEUES = (
         exchange=Exchange('fetch_pk_data'),
         routing_key='fetch_pk_data'
     ),
+    Queue(
+        name='enrich_imdb_data',
+        exchange=Exchange('enrich_imdb_data'),
+        routing_key='enrich_imdb_data'
+    ),
     Queue(
         name='send_email',
         exchange=Exchange('send_email'),
@@ -67,6 +159,16 @@ CELERY_ROUTES = {
         'queue': 'fetch_pk_data',
         'routing_key': 'fetch_pk_data'
     },
+    'clapperboard.workers.tasks.enrich_imdb_data': {
+        'queue': 'enrich_imdb_data',
+        'routing_key': 'enrich_imdb_data'
+    },
+    # Schedule snapshots are rebuilt one at a time by the single process of
+    # fetch_pk_data worker
+    'clapperboard.workers.tasks.write_schedule_snapshots': {
+        'queue': 'fetch_pk_data',
+        'routing_key': 'fetch_pk_data'
+    },
     'clapperboard.workers.tasks.send_email': {
         'queue': 'send_email',
         'routing_key': 'send_email'
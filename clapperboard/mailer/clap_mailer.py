@@ -1,4 +1,4 @@
-import requests
+from clapperboard.client import http_client
 
 
 class ClapMailer(object):
@@ -32,7 +32,8 @@ class MailgunClient(object):
         self.api_key = api_key
 
     def send_email(self, **kwargs):
-        response = requests.post(self.endpoint, data=kwargs, auth=self.auth)
+        response = http_client.post(self.endpoint, data=kwargs,
+                                    auth=self.auth)
         response.raise_for_status()
         return response
 
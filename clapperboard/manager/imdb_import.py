@@ -0,0 +1,24 @@
+from flask import current_app
+from flask.ext.script import Command, Option
+
+from clapperboard.common.imdb_dataset import import_dataset
+
+
+class IMDBImportCommand(Command):
+    """
+    Import IMDB dataset dumps used by 'dataset' IMDB resolver. Requires a
+    MySQL database.
+    """
+
+    option_list = (
+        Option('-d', '--directory', dest='directory', required=True,
+               help='Directory with IMDB dataset dumps'),
+        Option('-c', '--chunk-size', dest='chunk_size', type=int,
+               default=None, help='Number of rows inserted at once'),
+    )
+
+    def run(self, directory, chunk_size):
+        import_dataset(
+            directory,
+            chunk_size or current_app.config['IMDB_IMPORT_CHUNK_SIZE']
+        )
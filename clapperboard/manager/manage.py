@@ -4,11 +4,13 @@ from clapperboard import app
 from clapperboard import models
 
 from clapperboard.manager import manager
+from clapperboard.manager.imdb_import import IMDBImportCommand
 from clapperboard.models import db
 from clapperboard.workers.tasks import write_movie_data
 
 
 manager.add_command('db', MigrateCommand)
+manager.add_command('imdb-import', IMDBImportCommand())
 
 
 @manager.command
@@ -16,9 +18,7 @@ def fetch():
     """
     Run celery task forcefully to populate the database.
     """
-    write_movie_data.s(
-        not app.config['RELY_ON_LAST_MODIFIED']
-    ).apply_async(
+    write_movie_data.s(True).apply_async(
         queue='fetch_pk_data',
         routing_key='fetch_pk_data'
     )
@@ -1,3 +1,8 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+
 from flask.ext.sqlalchemy import BaseQuery
 
 from flask.ext.restful import abort
@@ -14,3 +19,75 @@ class ClapQuery(BaseQuery):
                 error_code, status='error', code=error_code, message=error_msg
             )
         return rv
+
+
+class QueryCounter(object):
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Count SQL statements executed by engine within the block.
+
+        with count_queries(db.engine) as queries:
+            ...
+        log.info(queries.count)
+    """
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+
+def add_unique(session, instance):
+    """
+    Add a new instance whose row may be inserted by another process at the
+    same time.
+
+    The instance is flushed within a savepoint. If a row with the same
+    primary key exists already the savepoint is rolled back and that row
+    is read with a locking read, which sees rows committed by other
+    transactions, and is returned instead, so that the caller's
+    transaction goes on.
+
+    :param session: Database session
+    :param instance: New model instance with primary key set
+    :return: Persistent instance, either the added or the existing one
+    """
+    mapper = inspect(instance).mapper
+    identity = mapper.primary_key_from_instance(instance)
+    try:
+        with session.begin_nested():
+            session.add(instance)
+        return instance
+    except IntegrityError:
+        model = type(instance)
+        return session.query(model).filter(*[
+            column == value
+            for column, value in zip(mapper.primary_key, identity)
+        ]).with_for_update().one()
+
+
+def add_all_unique(session, instances):
+    """
+    Add new instances like add_unique, but with a single savepoint and
+    flush for all of them unless some of their rows exist already.
+
+    :param session: Database session
+    :param instances: New model instances with primary keys set
+    :return: List of persistent instances in order of instances
+    """
+    instances = list(instances)
+    try:
+        with session.begin_nested():
+            session.add_all(instances)
+        return instances
+    except IntegrityError:
+        return [add_unique(session, instance) for instance in instances]
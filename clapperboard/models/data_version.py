@@ -0,0 +1,17 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class DataVersion(db.Model):
+    query_class = ClapQuery
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __init__(self, version, updated_at):
+        self.version = version
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return '<DataVersion %r>' % self.version
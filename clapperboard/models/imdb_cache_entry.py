@@ -0,0 +1,20 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class IMDBCacheEntry(db.Model):
+    query_class = ClapQuery
+
+    key = db.Column(db.String(255), primary_key=True)
+    imdb_id = db.Column(db.Integer)
+    data = db.Column(db.Text)
+    fetched_at = db.Column(db.DateTime)
+
+    def __init__(self, key, imdb_id, data, fetched_at):
+        self.key = key
+        self.imdb_id = imdb_id
+        self.data = data
+        self.fetched_at = fetched_at
+
+    def __repr__(self):
+        return '<IMDBCacheEntry %r>' % self.key
@@ -13,7 +13,8 @@ class IMDBData(db.Model):
     cast = db.Column(db.String(4096))
     runtime = db.Column(db.Integer)
     rating = db.Column(db.Float)
-    movies = db.relationship('Movie', backref='imdb_data', lazy='joined')
+    content_hash = db.Column(db.String(32))
+    movies = db.relationship('Movie', backref='imdb_data')
 
     def __init__(self, id, title, genre, country, director, cast, runtime,
                  rating):
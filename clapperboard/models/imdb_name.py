@@ -0,0 +1,16 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class IMDBName(db.Model):
+    query_class = ClapQuery
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(255))
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+    def __repr__(self):
+        return '<IMDBName %r>' % self.id
@@ -0,0 +1,20 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class IMDBPrincipal(db.Model):
+    query_class = ClapQuery
+
+    title_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    ordering = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name_id = db.Column(db.Integer)
+    category = db.Column(db.String(32))
+
+    def __init__(self, title_id, ordering, name_id, category):
+        self.title_id = title_id
+        self.ordering = ordering
+        self.name_id = name_id
+        self.category = category
+
+    def __repr__(self):
+        return '<IMDBPrincipal %r>' % ((self.title_id, self.ordering),)
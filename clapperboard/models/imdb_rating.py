@@ -0,0 +1,18 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class IMDBRating(db.Model):
+    query_class = ClapQuery
+
+    title_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    rating = db.Column(db.Float)
+    votes = db.Column(db.Integer)
+
+    def __init__(self, title_id, rating, votes):
+        self.title_id = title_id
+        self.rating = rating
+        self.votes = votes
+
+    def __repr__(self):
+        return '<IMDBRating %r>' % self.title_id
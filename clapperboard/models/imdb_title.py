@@ -0,0 +1,27 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class IMDBTitle(db.Model):
+    query_class = ClapQuery
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title_type = db.Column(db.String(32))
+    primary_title = db.Column(db.String(512))
+    original_title = db.Column(db.String(512))
+    start_year = db.Column(db.Integer)
+    runtime = db.Column(db.Integer)
+    genres = db.Column(db.String(255))
+
+    def __init__(self, id, title_type, primary_title, original_title,
+                 start_year, runtime, genres):
+        self.id = id
+        self.title_type = title_type
+        self.primary_title = primary_title
+        self.original_title = original_title
+        self.start_year = start_year
+        self.runtime = runtime
+        self.genres = genres
+
+    def __repr__(self):
+        return '<IMDBTitle %r>' % self.id
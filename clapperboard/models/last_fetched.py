@@ -7,11 +7,13 @@ class LastFetched(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     date_time = db.Column(db.DateTime)
+    etag = db.Column(db.String(255))
     theatre_id = db.Column(db.Integer, db.ForeignKey('theatre.id'))
 
-    def __init__(self, date_time, theatre_id):
+    def __init__(self, date_time, theatre_id, etag=None):
         self.date_time = date_time
         self.theatre_id = theatre_id
+        self.etag = etag
 
     def __repr__(self):
         return '<FetchHistory %r>' % self.id
@@ -10,6 +10,7 @@ class Movie(db.Model):
     url_code = db.Column(db.String(255))
     show_start = db.Column(db.Date)
     show_end = db.Column(db.Date)
+    content_hash = db.Column(db.String(32))
     imdb_id = db.Column(db.Integer, db.ForeignKey('imdb_data.id'))
     meta = db.relationship('MovieMetadata', backref='movie', uselist=False)
     show_times = db.relationship('ShowTime', backref='movie', lazy='dynamic')
@@ -0,0 +1,21 @@
+from clapperboard.models import db
+from clapperboard.models.common.utils import ClapQuery
+
+
+class ScheduleSnapshot(db.Model):
+    query_class = ClapQuery
+
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theatre.id'),
+                           primary_key=True, autoincrement=False)
+    data = db.Column(db.Text(4294967295))
+    etag = db.Column(db.String(32))
+    generated_at = db.Column(db.DateTime)
+
+    def __init__(self, theatre_id, data, etag, generated_at):
+        self.theatre_id = theatre_id
+        self.data = data
+        self.etag = etag
+        self.generated_at = generated_at
+
+    def __repr__(self):
+        return '<ScheduleSnapshot %r>' % self.theatre_id
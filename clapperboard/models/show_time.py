@@ -4,6 +4,12 @@ from clapperboard.models.common.utils import ClapQuery
 
 class ShowTime(db.Model):
     query_class = ClapQuery
+    __table_args__ = (
+        db.Index('ix_show_time_date_time_id', 'date_time', 'id'),
+        db.Index('ix_show_time_theatre_id_date_time', 'theatre_id',
+                 'date_time'),
+        db.Index('ix_show_time_movie_id_date_time', 'movie_id', 'date_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=False)
     theatre_id = db.Column(db.Integer, db.ForeignKey('theatre.id'))
@@ -21,6 +21,10 @@ class User(db.Model):
     def __repr__(self):
         return '<User %r>' % self.id
 
+    @property
+    def is_admin(self):
+        return self.id == 1
+
     def hash_password(self, password):
         self.password_hash = generate_password_hash(password)
 
@@ -1,5 +1,6 @@
+from flask import current_app
+
 from flask.ext.restful import Api, abort
-from flask.ext.restful.representations.json import settings as json_settings
 
 from flask.ext.jwt import JWT, jwt_required
 from flask.ext.cors import CORS
@@ -15,7 +16,11 @@ from clapperboard.resources.movie import (
     MovieShowTimeAPI
 )
 from clapperboard.resources.showtime import ShowTimeAPI, ShowTimesListAPI
-from clapperboard.resources.theatre import TheatreAPI, TheatreListAPI
+from clapperboard.resources.theatre import (
+    TheatreAPI,
+    TheatreListAPI,
+    TheatreScheduleAPI
+)
 from clapperboard.resources.technology import TechnologyAPI, TechnologyListAPI
 from clapperboard.resources.user import (
     UserAPI,
@@ -23,10 +28,25 @@ from clapperboard.resources.user import (
     UserVerifyEmailAPI,
     UserResendVerificationEmail
 )
+from clapperboard.resources.common.representations import (
+    output_json,
+    compress_response
+)
 from clapperboard.models.user import User
+from clapperboard.cache import user_cache
+from clapperboard.cache.user_cache import CachedUser
 
 
 class ClapApi(Api):
+    def __init__(self, *args, **kwargs):
+        super(ClapApi, self).__init__(*args, **kwargs)
+        self.representations = {'application/json': output_json}
+
+    def init_app(self, app):
+        super(ClapApi, self).init_app(app)
+        if compress_response not in app.after_request_funcs.get(None, []):
+            app.after_request(compress_response)
+
     def make_response(self, data, *args, **kwargs):
         # TODO: This is unreliable!
         if locals()['args'][0] >= 400:
@@ -56,6 +76,9 @@ api.add_resource(ShowTimeAPI, '/showtimes/<int:showtime_id>')
 
 api.add_resource(TheatreListAPI, '/theatres', '/theatres/')
 api.add_resource(TheatreAPI, '/theatres/<int:theatre_id>')
+api.add_resource(
+    TheatreScheduleAPI, '/theatres/<int:theatre_id>/schedule'
+)
 
 api.add_resource(TechnologyListAPI, '/technologies')
 api.add_resource(TechnologyAPI, '/technologies/<int:technology_id>')
@@ -79,9 +102,6 @@ def user_verify_email_url(payload):
     )
 
 
-json_settings['indent'] = 4
-
-
 @parser.error_handler
 def webargs_error_handler(err):
     """
@@ -102,6 +122,20 @@ def authenticate(username, password):
         return u
 
 
+@jwt.payload_handler
+def make_payload(user):
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'is_admin': user.is_admin
+    }
+
+
 @jwt.user_handler
 def load_user(payload):
-    return User.query.get(payload['user_id'])
+    # Tokens issued before claims were added to them are still valid
+    if current_app.config['JWT_USER_FROM_CLAIMS'] and 'is_admin' in payload:
+        return CachedUser(
+            payload['user_id'], payload['username'], payload['is_admin']
+        )
+    return user_cache.get(payload['user_id'])
@@ -11,7 +11,7 @@ from flask.ext.jwt import current_user
 def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        if current_user.id != 1:
+        if not current_user.is_admin:
             abort(401)
         return f(*args, **kwargs)
     return decorated
@@ -1,13 +1,27 @@
+import datetime
 import re
 
+from flask import current_app
+
 from webargs.core import ValidationError, __type_map__, text_type
 
+from clapperboard.common.utils import local_to_utc_datetime
+from clapperboard.resources.common.cursors import decode_cursor
 from clapperboard.resources.common.errors import (
     TYPE_MISMATCH,
     EMAIL_INVALID,
     USERNAME_INVALID,
     PASSWORD_INVALID,
-    PARAM_NOT_IN_OBJECT
+    PARAM_NOT_IN_OBJECT,
+    INVALID_CURSOR,
+    INVALID_LIMIT,
+    INVALID_ID,
+    INVALID_DATE,
+    DATE_OUT_OF_RANGE,
+    INVALID_DAYS,
+    INVALID_RATING,
+    INVALID_EXPAND,
+    EXPAND_REQUIRES_SHOWTIMES
 )
 
 
@@ -23,6 +37,61 @@ def movie_list_q_params_validator(val):
         _validation_error(msg)
 
 
+def limit_validator(val):
+    max_limit = current_app.config['API_MAX_PAGE_SIZE']
+    if not 1 <= val <= max_limit:
+        _validation_error(INVALID_LIMIT.format(max_limit))
+
+
+def cursor_validator(val):
+    try:
+        decode_cursor(val)
+    except ValueError:
+        _validation_error(INVALID_CURSOR)
+
+
+def id_validator(val):
+    if val < 1:
+        _validation_error(INVALID_ID.format(val))
+
+
+def date_validator(val):
+    try:
+        day = datetime.datetime.strptime(val, '%Y-%m-%d')
+    except ValueError:
+        _validation_error(INVALID_DATE.format(val))
+    # Both ends of the day must be representable in UTC
+    try:
+        local_to_utc_datetime(day)
+        local_to_utc_datetime(day + datetime.timedelta(days=1))
+    except OverflowError:
+        _validation_error(DATE_OUT_OF_RANGE.format(val))
+
+
+def days_validator(val):
+    max_days = current_app.config['API_MAX_DAYS']
+    if not 1 <= val <= max_days:
+        _validation_error(INVALID_DAYS.format(max_days))
+
+
+def rating_validator(val):
+    if not 0 <= val <= 10:
+        _validation_error(INVALID_RATING)
+
+
+def movie_expand_validator(val):
+    _validate_expand(val, ('imdb_data', 'showtimes', 'theatre', 'technology'))
+    # Theatre and technology are embedded into showtimes of a movie
+    names = val.split(',')
+    if 'showtimes' not in names and ('theatre' in names or
+                                     'technology' in names):
+        _validation_error(EXPAND_REQUIRES_SHOWTIMES)
+
+
+def showtime_expand_validator(val):
+    _validate_expand(val, ('theatre', 'technology'))
+
+
 def movie_metadata_json_validator(val):
     if ('tracker_ignore_imdb_not_found' in val and
             not isinstance(val['tracker_ignore_imdb_not_found'], bool)):
@@ -57,6 +126,14 @@ def _email_valid(email):
     return re.match(r'[^@]+@[^@]+\.[^@]+', email)
 
 
+def _validate_expand(val, supported):
+    for name in val.split(','):
+        if name not in supported:
+            _validation_error(INVALID_EXPAND.format(
+                name, ', '.join('"{}"'.format(s) for s in supported)
+            ))
+
+
 def _validation_error(msg):
     raise ValidationError(msg, status_code=400, message=msg)
 
@@ -0,0 +1,158 @@
+import calendar
+from functools import wraps
+
+from flask import current_app, request
+from flask.ext.restful.utils import unpack
+
+from werkzeug.urls import url_encode
+from werkzeug.http import http_date
+from werkzeug.wrappers import BaseResponse
+
+from clapperboard.cache import data_version, response_cache, ref_cache
+from clapperboard.resources.common.filters import (
+    TIME_RELATIVE_ARGS,
+    relative_now
+)
+from clapperboard.resources.common.representations import (
+    output_json,
+    pretty_requested
+)
+
+
+# Content encodings compress_response may append to an ETag
+ETAG_ENCODINGS = ('gzip', 'br')
+
+
+def conditional(f):
+    """
+    Make a read resource method answer conditional requests.
+
+    ETag and Last-Modified of the response are derived from the data
+    version, so a request whose If-None-Match or If-Modified-Since
+    matches the current version gets 304 Not Modified without the method
+    being called at all. For queries relative to current time they are
+    also derived from the current time step, so that a response is not
+    validated once its time window has moved. Indented and compact
+    bodies of the same data get different ETags.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        version, updated_at = data_version.current()
+        etag = 'v{}'.format(version)
+        time_step = _time_step()
+        if time_step:
+            etag = '{}-t{}'.format(
+                etag, calendar.timegm(time_step.utctimetuple())
+            )
+            if updated_at is None or updated_at < time_step:
+                updated_at = time_step
+        if pretty_requested():
+            etag = '{}-pretty'.format(etag)
+
+        if _not_modified(etag, updated_at):
+            resp = current_app.response_class(status=304)
+            _set_cache_headers(resp.headers, etag, updated_at)
+            return resp
+
+        data, code, headers = unpack(f(*args, **kwargs))
+        if isinstance(data, BaseResponse):
+            _set_cache_headers(data.headers, etag, updated_at)
+            return data
+        headers = dict(headers)
+        _set_cache_headers(headers, etag, updated_at)
+        return data, code, headers
+    return decorated
+
+
+def cached(f):
+    """
+    Cache serialized body of a successful response of a read resource
+    method in response cache, keyed by endpoint, query arguments and data
+    version, and by the time step of queries relative to current time.
+
+    Theatres and technologies are reloaded before a body is built, so that
+    a body cached for a data version is not built from reference data
+    older than that version.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = _cache_key()
+        body = response_cache.get(key)
+        if body is None:
+            ref_cache.load()
+            data, code, headers = unpack(f(*args, **kwargs))
+            if isinstance(data, BaseResponse) or code != 200:
+                return data, code, headers
+            resp = output_json(data, code, headers)
+            response_cache.set(key, resp.get_data())
+            return resp
+        return current_app.response_class(
+            body, content_type='application/json'
+        )
+    return decorated
+
+
+def _cache_key():
+    version, _ = data_version.current()
+    key = '{}:{}:{}?{}'.format(
+        version, request.endpoint,
+        url_encode(request.view_args or {}, sort=True),
+        url_encode(request.args, sort=True)
+    )
+    time_step = _time_step()
+    if time_step:
+        key = '{}@{}'.format(key, calendar.timegm(time_step.utctimetuple()))
+    return key
+
+
+def _time_step():
+    """
+    :return: Start of the current time step if the request is relative to
+             current time, otherwise None
+    """
+    if any(request.args.get(arg) for arg in TIME_RELATIVE_ARGS):
+        return relative_now()
+
+
+def etag_response(body, etag, last_modified):
+    """
+    Make a JSON response of a body stored together with its ETag, or 304
+    Not Modified if the client has this version of the body already.
+    """
+    if _etag_matches(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = current_app.response_class(
+            body, content_type='application/json'
+        )
+    _set_cache_headers(resp.headers, etag, last_modified)
+    return resp
+
+
+def _etag_matches(etag):
+    return any(
+        request.if_none_match.contains(tag) for tag in
+        [etag] + ['{}-{}'.format(etag, enc) for enc in ETAG_ENCODINGS]
+    )
+
+
+def _not_modified(etag, updated_at):
+    if request.if_none_match:
+        return _etag_matches(etag)
+    if request.if_modified_since and updated_at:
+        return (calendar.timegm(updated_at.utctimetuple()) <=
+                calendar.timegm(request.if_modified_since.utctimetuple()))
+    return False
+
+
+def _set_cache_headers(headers, etag, updated_at):
+    headers['ETag'] = '"{}"'.format(etag)
+    if updated_at:
+        headers['Last-Modified'] = http_date(updated_at)
+    # Shared caches must not store responses to authenticated requests and
+    # serve them to other clients
+    visibility = 'private' if 'Authorization' in request.headers else 'public'
+    headers['Cache-Control'] = '{}, max-age={}'.format(
+        visibility, current_app.config['HTTP_CACHE_MAX_AGE']
+    )
+    headers['Vary'] = 'Authorization'
@@ -0,0 +1,83 @@
+import base64
+import datetime
+import json
+import numbers
+
+from sqlalchemy.types import Date, DateTime, Integer
+
+from webargs.core import text_type
+
+
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def encode_cursor(values, order_by):
+    """
+    Encode values of the order_by columns of a row into a pagination
+    cursor.
+    """
+    values = [
+        _encode_value(value, column) for value, column in zip(values, order_by)
+    ]
+    return base64.urlsafe_b64encode(
+        json.dumps(values).encode('utf-8')
+    ).decode('ascii')
+
+
+def decode_cursor(cursor, order_by=None):
+    """
+    Decode a pagination cursor.
+
+    :param cursor: Cursor made by encode_cursor
+    :param order_by: Columns the cursor is to match. If given, cursor
+                     values are checked against and converted to the types
+                     of these columns
+    :return: List of cursor values
+    :raise ValueError: If the cursor is malformed or does not match the
+                       columns
+    """
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+    except TypeError as e:
+        raise ValueError(str(e))
+    if not isinstance(values, list):
+        raise ValueError('Cursor is not a list of values')
+    if order_by is None:
+        return values
+    if len(values) != len(order_by):
+        raise ValueError('Cursor does not match the order of results')
+    return [
+        _decode_value(value, column) for value, column in zip(values, order_by)
+    ]
+
+
+def _encode_value(value, column):
+    if isinstance(column.type, DateTime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(column.type, Date):
+        return value.strftime(DATE_FORMAT)
+    return value
+
+
+def _decode_value(value, column):
+    if isinstance(column.type, (DateTime, Date)):
+        if not isinstance(value, text_type):
+            raise ValueError('{} cursor value must be a string'
+                             .format(column.key))
+        if isinstance(column.type, DateTime):
+            return datetime.datetime.strptime(value, DATETIME_FORMAT)
+        return datetime.datetime.strptime(value, DATE_FORMAT).date()
+    if isinstance(column.type, Integer):
+        # bool is an int too
+        if (not isinstance(value, numbers.Integral) or
+                isinstance(value, bool)):
+            raise ValueError('{} cursor value must be an integer'
+                             .format(column.key))
+        return value
+    if not isinstance(value, (text_type, numbers.Number)):
+        raise ValueError('{} cursor value must be a scalar'
+                         .format(column.key))
+    return value
@@ -1,12 +1,25 @@
 MOVIE_NOT_FOUND = "Movie {} not found"
 THEATRE_NOT_FOUND = "Theatre {} not found"
 TECHNOLOGY_NOT_FOUND = "Technology {} not found"
+SCHEDULE_NOT_FOUND = "Schedule of theatre {} not found"
 SHOWTIME_NOT_FOUND = "Showtime {} not found"
 IMDB_DATA_NOT_FOUND = "IMDB data {} not found"
 PARAM_NOT_IN_OBJECT = "Required parameter '{}' not found in '{}' object"
 
 TYPE_MISMATCH = "Expected type {} for {}, got {}"
 
+INVALID_CURSOR = "Invalid cursor"
+INVALID_LIMIT = "Limit must be between 1 and {}"
+INVALID_ID = "Invalid id {}"
+INVALID_DATE = "Invalid date {}, expected format is YYYY-MM-DD"
+DATE_OUT_OF_RANGE = "Date {} is out of range"
+INVALID_DAYS = "Number of days must be between 1 and {}"
+INVALID_RATING = "Rating must be between 0 and 10"
+INVALID_EXPAND = ('Invalid value "{}" for parameter "expand". '
+                  'Supported values are {}')
+EXPAND_REQUIRES_SHOWTIMES = ('Expanding "theatre" and "technology" '
+                             'requires "showtimes"')
+
 USER_NOT_FOUND = "User {} not found"
 USER_NAME_EXISTS = "User with that username already exists"
 USER_EMAIL_EXISTS = "User with that email already exists"
@@ -0,0 +1,154 @@
+from collections import defaultdict
+
+from flask import current_app, request
+
+from webargs import Arg
+
+from werkzeug.urls import url_encode
+
+from clapperboard.models import db
+from clapperboard.models.movie import Movie
+from clapperboard.models.show_time import ShowTime
+from clapperboard.cache import ref_cache
+from clapperboard.resources.common.filters import (
+    filter_showtimes,
+    filter_q_params
+)
+from clapperboard.resources.common.pagination import (
+    cursor_after,
+    filter_after
+)
+from clapperboard.resources.common.serializers import (
+    imdb_data_serializer,
+    showtime_serializer,
+    theatre_serializer,
+    technology_serializer
+)
+from clapperboard.resources.common.arg_validators import (
+    movie_expand_validator,
+    showtime_expand_validator
+)
+
+
+movie_expand_q_params = {
+    'expand': Arg(str, target='querystring', validate=movie_expand_validator)
+}
+
+showtime_expand_q_params = {
+    'expand': Arg(
+        str, target='querystring', validate=showtime_expand_validator
+    )
+}
+
+
+def expand_movies(movies, args):
+    """
+    Embed related data requested with `expand` parameter into serialized
+    movies.
+
+    IMDB data and showtimes of all movies are read with one query each.
+    Embedded showtimes are filtered the same way as the movies are, and
+    theatre and technology are embedded into them.
+
+    At most API_MAX_EXPANDED_SHOWTIMES showtimes, the earliest ones, are
+    embedded into a page of movies. Movies whose showtimes are cut off get
+    `showtimes_next`, URL of the page of their showtimes that follows.
+
+    :param movies: List of serialized movies
+    :param args: Parsed query parameters
+    """
+    expand = _expand_names(args)
+    if not expand or not movies:
+        return
+    movie_ids = [movie['id'] for movie in movies]
+
+    if 'imdb_data' in expand:
+        rows = db.session.query(
+            Movie.id.label('movie_id'), *imdb_data_serializer.columns
+        ).join(Movie.imdb_data).filter(Movie.id.in_(movie_ids))
+        imdb_data = dict(
+            (row.movie_id, imdb_data_serializer.dump_row(row)) for row in rows
+        )
+        for movie in movies:
+            movie['imdb_data'] = imdb_data.get(movie['id'])
+
+    if 'showtimes' in expand:
+        max_showtimes = current_app.config['API_MAX_EXPANDED_SHOWTIMES']
+        order_by = (ShowTime.date_time, ShowTime.id)
+        query = filter_showtimes(ShowTime.query, args).filter(
+            ShowTime.movie_id.in_(movie_ids)
+        )
+        rows = query.with_entities(
+            ShowTime.movie_id, *showtime_serializer.columns
+        ).order_by(*order_by).limit(max_showtimes + 1).all()
+
+        next_urls = {}
+        if len(rows) > max_showtimes:
+            rows = rows[:max_showtimes]
+            # Showtimes of each movie are ordered the same way, so the
+            # rest of them all come after the last embedded one
+            cursor = cursor_after(rows[-1], order_by)
+            rest = filter_after(query, rows[-1], order_by).with_entities(
+                ShowTime.movie_id
+            ).distinct()
+            next_urls = dict(
+                (movie_id, _showtimes_next_url(movie_id, cursor))
+                for movie_id, in rest
+            )
+
+        showtimes = defaultdict(list)
+        for row in rows:
+            showtimes[row.movie_id].append(showtime_serializer.dump_row(row))
+        for movie in movies:
+            movie['showtimes'] = showtimes[movie['id']]
+            _expand_showtimes(movie['showtimes'], expand)
+            if movie['id'] in next_urls:
+                movie['showtimes_next'] = next_urls[movie['id']]
+
+
+def expand_showtimes(showtimes, args):
+    """
+    Embed related data requested with `expand` parameter into serialized
+    showtimes. Theatres and technologies come from the reference cache,
+    so no queries are made.
+
+    :param showtimes: List of serialized showtimes
+    :param args: Parsed query parameters
+    """
+    _expand_showtimes(showtimes, _expand_names(args))
+
+
+def _expand_showtimes(showtimes, expand):
+    for showtime in showtimes:
+        if 'theatre' in expand:
+            showtime['theatre'] = _dump_record(
+                theatre_serializer, ref_cache.theatre(showtime['theatre_id'])
+            )
+        if 'technology' in expand:
+            showtime['technology'] = _dump_record(
+                technology_serializer,
+                ref_cache.technology(showtime['technology_id'])
+            )
+
+
+def _showtimes_next_url(movie_id, cursor):
+    """
+    URL of the showtimes of a movie following a cursor, filtered the same
+    way as the current request.
+    """
+    next_args = dict(
+        (arg, value) for arg, value in request.args.items()
+        if arg in filter_q_params and arg != 'movie_id'
+    )
+    next_args['cursor'] = cursor
+    return '{}movies/{}/showtimes?{}'.format(
+        request.url_root, movie_id, url_encode(next_args)
+    )
+
+
+def _dump_record(serializer, record):
+    return serializer.dump_row(record) if record else None
+
+
+def _expand_names(args):
+    return set(args['expand'].split(',')) if args['expand'] else set()
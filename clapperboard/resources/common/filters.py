@@ -0,0 +1,124 @@
+import calendar
+import datetime
+
+from flask import current_app
+from sqlalchemy import and_
+
+from webargs import Arg
+
+from clapperboard.common.utils import local_to_utc_datetime
+from clapperboard.models.movie import Movie
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.models.show_time import ShowTime
+from clapperboard.resources.common.arg_validators import (
+    id_validator,
+    date_validator,
+    days_validator,
+    rating_validator
+)
+
+
+# Query arguments whose results depend on current time
+TIME_RELATIVE_ARGS = ('starting_within_days',)
+
+filter_q_params = {
+    'theatre_id': Arg(int, target='querystring', validate=id_validator),
+    'technology_id': Arg(int, target='querystring', validate=id_validator),
+    'movie_id': Arg(int, target='querystring', validate=id_validator),
+    'date_from': Arg(str, target='querystring', validate=date_validator),
+    'date_to': Arg(str, target='querystring', validate=date_validator),
+    'starting_within_days': Arg(
+        int, target='querystring', validate=days_validator
+    ),
+    'min_rating': Arg(float, target='querystring', validate=rating_validator)
+}
+
+
+def filter_showtimes(query, args):
+    """
+    Apply filter_q_params to a ShowTime query.
+
+    Dates are days in PK local time, both date_from and date_to are
+    inclusive. starting_within_days selects showtimes from now, as
+    returned by relative_now, until the given number of days from now.
+    """
+    conditions = _showtime_conditions(args)
+    if args['movie_id']:
+        conditions.append(ShowTime.movie_id == args['movie_id'])
+    if args['min_rating'] is not None:
+        conditions.append(
+            ShowTime.movie.has(
+                Movie.imdb_data.has(IMDBData.rating >= args['min_rating'])
+            )
+        )
+    return query.filter(*conditions) if conditions else query
+
+
+def filter_movies(query, args):
+    """
+    Apply filter_q_params to a Movie query.
+
+    Showtime related filters select movies having at least one matching
+    showtime.
+    """
+    conditions = []
+    if args['movie_id']:
+        conditions.append(Movie.id == args['movie_id'])
+    if args['min_rating'] is not None:
+        conditions.append(
+            Movie.imdb_data.has(IMDBData.rating >= args['min_rating'])
+        )
+    showtime_conditions = _showtime_conditions(args)
+    if showtime_conditions:
+        conditions.append(Movie.show_times.any(and_(*showtime_conditions)))
+    return query.filter(*conditions) if conditions else query
+
+
+def _showtime_conditions(args):
+    conditions = []
+    if args['theatre_id']:
+        conditions.append(ShowTime.theatre_id == args['theatre_id'])
+    if args['technology_id']:
+        conditions.append(ShowTime.technology_id == args['technology_id'])
+    if args['date_from']:
+        conditions.append(
+            ShowTime.date_time >= _day_start(args['date_from'])
+        )
+    if args['date_to']:
+        conditions.append(
+            ShowTime.date_time < _day_start(args['date_to'], days=1)
+        )
+    if args['starting_within_days']:
+        now = relative_now()
+        conditions.append(ShowTime.date_time >= now)
+        conditions.append(
+            ShowTime.date_time <
+            now + datetime.timedelta(days=args['starting_within_days'])
+        )
+    return conditions
+
+
+def relative_now():
+    """
+    Get current UTC time rounded down to RELATIVE_TIME_STEP seconds.
+
+    Queries relative to current time give the same result throughout a
+    step, so their responses can be cached and validated for its duration.
+
+    :return: datetime object
+    """
+    step = current_app.config['RELATIVE_TIME_STEP']
+    timestamp = calendar.timegm(datetime.datetime.utcnow().utctimetuple())
+    return datetime.datetime.utcfromtimestamp(timestamp - timestamp % step)
+
+
+def _day_start(date_string, days=0):
+    """
+    Get UTC datetime of the beginning of a PK local day.
+
+    :param date_string: Date in YYYY-MM-DD format
+    :param days: Number of days to add to the date
+    :return: datetime object
+    """
+    day = datetime.datetime.strptime(date_string, '%Y-%m-%d')
+    return local_to_utc_datetime(day + datetime.timedelta(days=days))
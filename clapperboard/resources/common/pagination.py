@@ -0,0 +1,96 @@
+from flask import current_app, request
+
+from flask.ext.restful import abort
+
+from sqlalchemy import and_, or_
+
+from webargs import Arg
+
+from werkzeug.urls import url_encode
+
+from clapperboard.resources.common.errors import INVALID_CURSOR
+from clapperboard.resources.common.cursors import (
+    decode_cursor,
+    encode_cursor
+)
+from clapperboard.resources.common.arg_validators import (
+    cursor_validator,
+    limit_validator
+)
+
+
+pagination_q_params = {
+    'limit': Arg(int, target='querystring', validate=limit_validator),
+    'cursor': Arg(str, target='querystring', validate=cursor_validator)
+}
+
+
+def paginate(query, order_by, args):
+    """
+    Get a page of query results using keyset pagination.
+
+    Results are ordered by `order_by` columns and the page starts right
+    after the row the cursor points to, so no rows are skipped or repeated
+    when the data changes between requests, and getting a page costs the
+    same regardless of its position.
+
+    :param query: Query to paginate
+    :param order_by: Sequence of columns uniquely identifying a row,
+                     e.g. (ShowTime.date_time, ShowTime.id)
+    :param args: Parsed pagination_q_params
+    :return: Tuple (list of rows, URL of the next page or None)
+    """
+    limit = args['limit'] or current_app.config['API_DEFAULT_PAGE_SIZE']
+    if args['cursor']:
+        try:
+            values = decode_cursor(args['cursor'], order_by)
+        except ValueError:
+            abort(400, status='error', code=400, message=INVALID_CURSOR)
+        query = query.filter(_after(order_by, values))
+
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_args = request.args.to_dict()
+        next_args.update(cursor=cursor_after(rows[-1], order_by), limit=limit)
+        next_url = '{}?{}'.format(request.base_url, url_encode(next_args))
+
+    return rows, next_url
+
+
+def cursor_after(row, order_by):
+    """
+    Get the cursor of a page starting right after `row`.
+
+    :param row: Row having values of all `order_by` columns
+    :param order_by: Columns results are ordered by
+    :return: Cursor string
+    """
+    return encode_cursor(
+        [getattr(row, column.key) for column in order_by], order_by
+    )
+
+
+def filter_after(query, row, order_by):
+    """
+    Filter a query to the rows that come after `row` in `order_by` order.
+    """
+    return query.filter(
+        _after(order_by, [getattr(row, column.key) for column in order_by])
+    )
+
+
+def _after(order_by, values):
+    """
+    Build a filter selecting rows that come after `values` in the
+    `order_by` order, i.e. (c1, c2, ...) > (v1, v2, ...).
+    """
+    column, value = order_by[0], values[0]
+    if len(order_by) == 1:
+        return column > value
+    return or_(
+        column > value,
+        and_(column == value, _after(order_by[1:], values[1:]))
+    )
@@ -0,0 +1,90 @@
+import gzip
+import io
+import json
+
+from flask import current_app, make_response, request
+
+# Optional faster JSON encoder and compression algorithm
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def dumps(data, pretty=False):
+    if pretty:
+        return json.dumps(data, indent=4)
+    if ujson:
+        return ujson.dumps(data, escape_forward_slashes=False)
+    return json.dumps(data, separators=(',', ':'))
+
+
+def pretty_requested():
+    """
+    Whether indented JSON has been requested with `pretty=1` query
+    parameter.
+    """
+    return request.args.get('pretty') in ('1', 'true')
+
+
+def output_json(data, code, headers=None):
+    """
+    Make a compact JSON response, or an indented one if requested with
+    `pretty=1` query parameter.
+    """
+    resp = make_response(dumps(data, pretty=pretty_requested()), code)
+    resp.headers.extend(headers or {})
+    resp.headers['Content-Type'] = 'application/json'
+    return resp
+
+
+def compress_response(response):
+    """
+    Compress response body with brotli or gzip, whichever the client
+    accepts, if compression is enabled and the body is large enough.
+    """
+    if (not current_app.config['COMPRESS_RESPONSES'] or
+            response.direct_passthrough or
+            not 200 <= response.status_code < 300 or
+            'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    level = current_app.config['COMPRESS_LEVEL']
+    if brotli and request.accept_encodings['br']:
+        encoding = 'br'
+        data = brotli.compress(data, quality=level)
+    elif request.accept_encodings['gzip']:
+        encoding = 'gzip'
+        data = _gzip(data, level)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = len(data)
+    # Compressed body is a different representation, so it must not share
+    # the ETag of the plain one
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag('{}-{}'.format(etag, encoding), weak)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _gzip(data, level):
+    buf = io.BytesIO()
+    gzip_file = gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=level)
+    try:
+        gzip_file.write(data)
+    finally:
+        gzip_file.close()
+    return buf.getvalue()
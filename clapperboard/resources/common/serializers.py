@@ -0,0 +1,96 @@
+from marshmallow import fields
+from marshmallow.exceptions import ValidationError
+
+from webargs.core import text_type
+
+from clapperboard.models.movie import Movie
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.models.show_time import ShowTime
+from clapperboard.models.theatre import Theatre
+from clapperboard.models.technology import Technology
+from clapperboard.resources.common.schemas import (
+    MovieSchema,
+    IMDBDataSchema,
+    ShowTimeSchema,
+    TheatreSchema,
+    TechnologySchema
+)
+
+
+class _Null(object):
+    """Object whose given attributes are all None."""
+
+    def __init__(self, attributes):
+        for attribute in attributes:
+            setattr(self, attribute, None)
+
+
+class RowSerializer(object):
+    """
+    Serializer producing the same output as a NamespacedSchema dumping
+    many objects, but from plain result rows, e.g. those of
+    query.with_entities(*serializer.columns), so that no ORM objects have
+    to be created.
+
+    Field conversions are chosen once when the serializer is created.
+    Values of None are serialized the way the schema serializes them,
+    which is determined up front by dumping an object with no data. A row
+    holding a value its field rejects is dumped by the schema itself.
+    """
+
+    def __init__(self, schema_class, model):
+        schema = schema_class(many=True)
+        self._schema = schema
+        self.namespace = schema.opts.plural_name
+        null_item = schema.dump([_Null(
+            field.attribute or name for name, field in schema.fields.items()
+        )]).data[self.namespace][0]
+
+        self.columns = []
+        self._fields = []
+        for name, field in schema.fields.items():
+            attribute = field.attribute or name
+            self.columns.append(getattr(model, attribute))
+            self._fields.append((
+                name, attribute, _converter(field), name in null_item,
+                null_item.get(name)
+            ))
+
+    def dump(self, rows):
+        return {self.namespace: [self.dump_row(row) for row in rows]}
+
+    def dump_row(self, row):
+        item = {}
+        for name, attribute, convert, has_null, null_value in self._fields:
+            value = getattr(row, attribute)
+            if value is not None:
+                try:
+                    item[name] = convert(value)
+                except ValidationError:
+                    return self._schema.dump([row]).data[self.namespace][0]
+            elif has_null:
+                item[name] = null_value
+        return item
+
+
+def _converter(field):
+    # Strings, integers and floats are converted directly; any other field
+    # is left to marshmallow
+    if isinstance(field, fields.String) and not isinstance(
+            field, (fields.Url, fields.Email)):
+        return text_type
+    if isinstance(field, fields.Integer):
+        return int
+    if isinstance(field, fields.Float):
+        return float
+
+    def convert(value):
+        return field._serialize(value, None, None)
+    return convert
+
+
+movie_serializer = RowSerializer(MovieSchema, Movie)
+imdb_data_serializer = RowSerializer(IMDBDataSchema, IMDBData)
+showtime_serializer = RowSerializer(ShowTimeSchema, ShowTime)
+theatre_serializer = RowSerializer(TheatreSchema, Theatre)
+technology_serializer = RowSerializer(TechnologySchema, Technology)
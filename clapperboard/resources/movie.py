@@ -1,11 +1,31 @@
 import json
 
+from flask import make_response
+
 from flask.ext.restful import Resource, abort
 
 from webargs import Arg
 from webargs.flaskparser import use_args
 
 from clapperboard.resources.common import admin_required
+from clapperboard.resources.common.pagination import (
+    paginate,
+    pagination_q_params
+)
+from clapperboard.resources.common.filters import (
+    filter_movies,
+    filter_showtimes,
+    filter_q_params
+)
+from clapperboard.resources.common.expansion import (
+    expand_movies,
+    movie_expand_q_params
+)
+from clapperboard.resources.common.caching import cached, conditional
+from clapperboard.resources.common.serializers import (
+    movie_serializer,
+    showtime_serializer
+)
 from clapperboard.resources.common.schemas import (
     MovieSchema,
     IMDBDataSchema,
@@ -25,14 +45,24 @@ from clapperboard.resources.common.arg_validators import (
     movie_list_q_params_validator,
     movie_metadata_json_validator
 )
-from clapperboard.common.utils import get_movie_imdb_data
+from clapperboard.cache import data_version, imdb_cache
+from clapperboard.workers.tasks import (
+    enrich_imdb_data,
+    write_schedule_snapshots,
+    _update_movie_record_imdb_data
+)
 
 
-movie_list_q_params = {
-    'imdb_data': Arg(
+movie_list_q_params = dict(
+    pagination_q_params,
+    imdb_data=Arg(
         str, target='querystring', validate=movie_list_q_params_validator
     )
-}
+)
+movie_list_q_params.update(filter_q_params)
+movie_list_q_params.update(movie_expand_q_params)
+
+movie_showtime_list_q_params = dict(pagination_q_params, **filter_q_params)
 
 imdb_data_json = {
     'imdb_data': Arg(
@@ -58,8 +88,9 @@ movie_metadata_edit_json = {
 class MovieListAPI(Resource):
     def __init__(self):
         super(MovieListAPI, self).__init__()
-        self.movie_schema = MovieSchema(many=True)
 
+    @conditional
+    @cached
     @use_args(movie_list_q_params)
     def get(self, args):
         movies = Movie.query
@@ -67,9 +98,14 @@ class MovieListAPI(Resource):
             movies = movies.filter(Movie.imdb_data == None)
         elif args['imdb_data'] == 'non_empty':
             movies = movies.filter(Movie.imdb_data != None)
-        movies = movies.all()
-        res = self.movie_schema.dump(movies)
-        return res.data
+        movies = filter_movies(movies, args).with_entities(
+            *movie_serializer.columns
+        )
+        movies, next_url = paginate(movies, (Movie.id,), args)
+        res = movie_serializer.dump(movies)
+        expand_movies(res['movies'], args)
+        res['next'] = next_url
+        return res
 
 
 class MovieAPI(Resource):
@@ -77,6 +113,7 @@ class MovieAPI(Resource):
         super(MovieAPI, self).__init__()
         self.movie_schema = MovieSchema()
 
+    @conditional
     def get(self, movie_id):
         movie = Movie.query.get_or_abort(
             movie_id, error_msg=MOVIE_NOT_FOUND.format(movie_id)
@@ -112,6 +149,7 @@ class MovieMetaDataAPI(Resource):
                 .format(movie_id)
             )
         movie.meta = MovieMetadata(json.dumps(args['metadata']), movie_id)
+        data_version.bump()
         db.session.commit()
         return args
 
@@ -134,6 +172,7 @@ class MovieMetaDataAPI(Resource):
             metadata_dict[k] = v
 
         movie.meta.data = json.dumps(metadata_dict)
+        data_version.bump()
         db.session.commit()
         return {
             'metadata': json.loads(movie.meta.data) if movie.meta else {}
@@ -145,6 +184,7 @@ class MovieIMDBDataAPI(Resource):
         super(MovieIMDBDataAPI, self).__init__()
         self.imdb_data_schema = IMDBDataSchema()
 
+    @conditional
     def get(self, movie_id):
         movie = Movie.query.get_or_abort(
             movie_id, error_msg=MOVIE_NOT_FOUND.format(movie_id)
@@ -152,7 +192,6 @@ class MovieIMDBDataAPI(Resource):
         res = self.imdb_data_schema.dump(movie.imdb_data)
         return res.data
 
-    # TODO: Make this call async
     @admin_required
     @use_args(imdb_data_json)
     def post(self, args, movie_id):
@@ -167,18 +206,11 @@ class MovieIMDBDataAPI(Resource):
                 .format(movie_id)
             )
 
-        imdb_id = args['imdb_data']['id']
-
         # TODO: Handle inexistent IMDB id
-        # TODO: Handle already existing IMDB record
-        imdb_data = IMDBData.query.get(args['imdb_data']['id'])
-        if imdb_data:
-            movie.imdb_data = imdb_data
-        else:
-            movie_imdb_data = get_movie_imdb_data(id=imdb_id)
-            movie.imdb_data = IMDBData(**movie_imdb_data)
-        db.session.commit()
-        return 200
+        enrich_imdb_data.s(
+            [movie_id], imdb_id=args['imdb_data']['id']
+        ).apply_async()
+        return make_response('', 202)
 
     @admin_required
     @use_args(imdb_data_json)
@@ -198,25 +230,33 @@ class MovieIMDBDataAPI(Resource):
 
         # TODO: Handle inexistent IMDB id
         # TODO: Handle already existing IMDB record
-        movie_imdb_data = get_movie_imdb_data(id=imdb_id)
-        for key in movie_imdb_data:
-            setattr(movie.imdb_data, key, movie_imdb_data[key])
+        movie_imdb_data = imdb_cache.get_movie_imdb_data(id=imdb_id)
+        _update_movie_record_imdb_data(movie, movie_imdb_data)
+        version = data_version.bump()
         db.session.commit()
+        write_schedule_snapshots.s(version).apply_async()
         return 200
 
 
 class MovieShowTimesListAPI(Resource):
     def __init__(self):
         super(MovieShowTimesListAPI, self).__init__()
-        self.showtime_schema = ShowTimeSchema(many=True)
 
-    def get(self, movie_id):
+    @conditional
+    @use_args(movie_showtime_list_q_params)
+    def get(self, args, movie_id):
         movie = Movie.query.get_or_abort(
             movie_id, error_msg=MOVIE_NOT_FOUND.format(movie_id)
         )
-        show_times = movie.show_times.all()
-        res = self.showtime_schema.dump(show_times)
-        return res.data
+        show_times = filter_showtimes(
+            movie.show_times, args
+        ).with_entities(*showtime_serializer.columns)
+        show_times, next_url = paginate(
+            show_times, (ShowTime.date_time, ShowTime.id), args
+        )
+        res = showtime_serializer.dump(show_times)
+        res['next'] = next_url
+        return res
 
 
 class MovieShowTimeAPI(Resource):
@@ -224,6 +264,7 @@ class MovieShowTimeAPI(Resource):
         super(MovieShowTimeAPI, self).__init__()
         self.showtime_schema = ShowTimeSchema()
 
+    @conditional
     def get(self, movie_id, showtime_id):
         Movie.query.get_or_abort(
             movie_id, error_msg=MOVIE_NOT_FOUND.format(movie_id)
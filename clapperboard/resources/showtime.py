@@ -1,19 +1,48 @@
 from flask.ext.restful import Resource
 
+from webargs.flaskparser import use_args
+
 from clapperboard.resources.common.schemas import ShowTimeSchema
+from clapperboard.resources.common.caching import cached, conditional
+from clapperboard.resources.common.serializers import showtime_serializer
+from clapperboard.resources.common.pagination import (
+    paginate,
+    pagination_q_params
+)
+from clapperboard.resources.common.filters import (
+    filter_showtimes,
+    filter_q_params
+)
+from clapperboard.resources.common.expansion import (
+    expand_showtimes,
+    showtime_expand_q_params
+)
 from clapperboard.models.show_time import ShowTime
 from clapperboard.resources.common.errors import SHOWTIME_NOT_FOUND
 
 
+showtime_list_q_params = dict(pagination_q_params, **filter_q_params)
+showtime_list_q_params.update(showtime_expand_q_params)
+
+
 class ShowTimesListAPI(Resource):
     def __init__(self):
         super(ShowTimesListAPI, self).__init__()
-        self.showtime_schema = ShowTimeSchema(many=True)
 
-    def get(self):
-        show_times = ShowTime.query.all()
-        res = self.showtime_schema.dump(show_times)
-        return res.data
+    @conditional
+    @cached
+    @use_args(showtime_list_q_params)
+    def get(self, args):
+        show_times = filter_showtimes(ShowTime.query, args).with_entities(
+            *showtime_serializer.columns
+        )
+        show_times, next_url = paginate(
+            show_times, (ShowTime.date_time, ShowTime.id), args
+        )
+        res = showtime_serializer.dump(show_times)
+        expand_showtimes(res['showtimes'], args)
+        res['next'] = next_url
+        return res
 
 
 class ShowTimeAPI(Resource):
@@ -21,6 +50,7 @@ class ShowTimeAPI(Resource):
         super(ShowTimeAPI, self).__init__()
         self.showtime_schema = ShowTimeSchema()
 
+    @conditional
     def get(self, showtime_id):
         show_time = ShowTime.query.get_or_abort(
             showtime_id, error_msg=SHOWTIME_NOT_FOUND.format(showtime_id)
@@ -1,8 +1,9 @@
-from flask.ext.restful import Resource, marshal
+from flask.ext.restful import Resource, abort
 
+from clapperboard.resources.common.caching import cached, conditional
 from clapperboard.resources.common.schemas import TechnologySchema
-from clapperboard.models.technology import Technology
 from clapperboard.resources.common.errors import TECHNOLOGY_NOT_FOUND
+from clapperboard.cache import ref_cache
 
 
 class TechnologyListAPI(Resource):
@@ -10,8 +11,10 @@ class TechnologyListAPI(Resource):
         super(TechnologyListAPI, self).__init__()
         self.technology_schema = TechnologySchema(many=True)
 
+    @conditional
+    @cached
     def get(self):
-        technologies = Technology.query.all()
+        technologies = ref_cache.technologies()
         res = self.technology_schema.dump(technologies)
         return res.data
 
@@ -21,9 +24,11 @@ class TechnologyAPI(Resource):
         super(TechnologyAPI, self).__init__()
         self.technology_schema = TechnologySchema()
 
+    @conditional
     def get(self, technology_id):
-        technology = Technology.query.get_or_abort(
-            technology_id, error_msg=TECHNOLOGY_NOT_FOUND.format(technology_id)
-        )
+        technology = ref_cache.technology(technology_id)
+        if technology is None:
+            abort(404, status='error', code=404,
+                  message=TECHNOLOGY_NOT_FOUND.format(technology_id))
         res = self.technology_schema.dump(technology)
         return res.data
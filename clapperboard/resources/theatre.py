@@ -1,9 +1,17 @@
-from flask.ext.restful import Resource
+from flask.ext.restful import Resource, abort
 
+from clapperboard.resources.common.caching import (
+    cached,
+    conditional,
+    etag_response
+)
 from clapperboard.resources.common.schemas import TheatreSchema
-from clapperboard.models.theatre import Theatre
-from clapperboard.models.last_fetched import LastFetched
-from clapperboard.resources.common.errors import THEATRE_NOT_FOUND
+from clapperboard.resources.common.errors import (
+    THEATRE_NOT_FOUND,
+    SCHEDULE_NOT_FOUND
+)
+from clapperboard.models.schedule_snapshot import ScheduleSnapshot
+from clapperboard.cache import ref_cache
 
 
 class TheatreListAPI(Resource):
@@ -11,8 +19,10 @@ class TheatreListAPI(Resource):
         super(TheatreListAPI, self).__init__()
         self.theatre_schema = TheatreSchema(many=True)
 
+    @conditional
+    @cached
     def get(self):
-        theatres = Theatre.query.all()
+        theatres = ref_cache.theatres()
         res = self.theatre_schema.dump(theatres)
         return res.data
 
@@ -22,9 +32,27 @@ class TheatreAPI(Resource):
         super(TheatreAPI, self).__init__()
         self.theatre_schema = TheatreSchema()
 
+    @conditional
     def get(self, theatre_id):
-        theatre = Theatre.query.get_or_abort(
-            theatre_id, error_msg=THEATRE_NOT_FOUND.format(theatre_id)
-        )
+        theatre = ref_cache.theatre(theatre_id)
+        if theatre is None:
+            abort(404, status='error', code=404,
+                  message=THEATRE_NOT_FOUND.format(theatre_id))
         res = self.theatre_schema.dump(theatre)
         return res.data
+
+
+class TheatreScheduleAPI(Resource):
+    def __init__(self):
+        super(TheatreScheduleAPI, self).__init__()
+
+    def get(self, theatre_id):
+        """
+        Serve schedule snapshot stored by write_movie_data as is.
+        """
+        snapshot = ScheduleSnapshot.query.get_or_abort(
+            theatre_id, error_msg=SCHEDULE_NOT_FOUND.format(theatre_id)
+        )
+        return etag_response(
+            snapshot.data, snapshot.etag, snapshot.generated_at
+        )
@@ -24,6 +24,7 @@ from clapperboard.resources.common.arg_validators import (
 from clapperboard.resources.common import get_serializer
 from clapperboard.models import db
 from clapperboard.models.user import User
+from clapperboard.cache import user_cache
 from clapperboard.workers.tasks import send_email
 
 
@@ -172,6 +173,7 @@ class UserAPI(Resource):
         if 'password' in args['user']:
             user.password = user.hash_password(args['user']['password'])
         db.session.commit()
+        user_cache.invalidate(user_id)
         res = self.user_schema.dump(user)
         return res.data
 
@@ -1,64 +1,64 @@
+import datetime
+import hashlib
 import json
 import logging
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import bindparam
 
 from clapperboard.models import db
+from clapperboard.models.common.utils import add_all_unique, count_queries
+from clapperboard.models.data_version import DataVersion
 from clapperboard.models.movie import Movie
 from clapperboard.models.movie_metadata import MovieMetadata
 from clapperboard.models.imdb_data import IMDBData
 from clapperboard.models.show_time import ShowTime
 from clapperboard.models.theatre import Theatre
-from clapperboard.models.technology import Technology
 from clapperboard.models.last_fetched import LastFetched
-from clapperboard.common.utils import get_pk_data, get_movie_imdb_data
+from clapperboard.models.schedule_snapshot import ScheduleSnapshot
+from clapperboard.common.utils import (
+    get_pk_data,
+    local_to_utc_datetime,
+    utc_to_local_datetime,
+    FETCH_UPDATED,
+    FETCH_FAILED
+)
+from clapperboard.cache import ref_cache, imdb_cache, data_version
+from clapperboard.client import http_client
 from clapperboard.mailer import mailer
+from clapperboard.resources.common.serializers import (
+    movie_serializer,
+    imdb_data_serializer,
+    showtime_serializer,
+    theatre_serializer,
+    technology_serializer
+)
 from clapperboard.workers import celery
 
 log = logging.getLogger(__name__)
 
+# Maximum number of rows affected by a single bulk statement
+SYNC_CHUNK_SIZE = 1000
 
-def _insert_movie_record(movie_data_dict):
-    movie_record = Movie(**movie_data_dict)
-
-    # Set IMDB data for the movie
-    imdb_query_title = movie_data_dict['url_code'].replace('-', ' ')
-    movie_imdb_data = get_movie_imdb_data(title=imdb_query_title)
-
-    if movie_imdb_data:
-        # TODO: Factor this (and all the below) into a function
-        imdb_data = IMDBData.query.get(movie_imdb_data['id'])
-        if imdb_data:
-            movie_record.imdb_data = imdb_data
-        else:
-            movie_record.imdb_data = IMDBData(**movie_imdb_data)
-    else:
-        msg = 'IMDB data not found for movie "{}"'.format(
-            movie_data_dict['url_code']
-        )
-        # TODO: Combine this into one custom logger class
-        log.warning(msg)
-        if (not movie_record.meta or not movie_record.meta.data or
-                not json.loads(movie_record.meta.data)
-                        .get('tracker_ignore_imdb_not_found')):
-            celery.tracker.report_message(msg, 'warning')
-
-    db.session.add(movie_record)
+SHOWTIME_COLUMNS = ('theatre_id', 'hall_id', 'technology_id', 'date_time',
+                    'order_url', 'movie_id')
 
+# Data version schedule snapshots have last been committed for by this
+# process
+_snapshots = dict(version=None)
 
-def _update_movie_record(record, movie_data_dict):
-    for key in movie_data_dict:
-        setattr(record, key, movie_data_dict[key])
 
+def _content_hash(data_dict):
+    data = json.dumps(data_dict, separators=(',', ':'), sort_keys=True,
+                      default=str)
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
 
-def _insert_movie_record_imdb_data(record):
-    imdb_query_title = record.url_code.replace('-', ' ')
 
-    movie_imdb_data = get_movie_imdb_data(title=imdb_query_title)
+def _insert_movie_record_imdb_data(record, movie_imdb_data, imdb_records):
     if movie_imdb_data:
-        imdb_data = IMDBData.query.get(movie_imdb_data['id'])
-        if imdb_data:
-            record.imdb_data = imdb_data
-        else:
-            record.imdb_data = IMDBData(**movie_imdb_data)
+        _set_movie_record_imdb_data(record, movie_imdb_data, imdb_records)
     else:
         msg = 'IMDB data not found for movie "{}"'.format(record.url_code)
         log.warning(msg)
@@ -68,121 +68,510 @@ def _insert_movie_record_imdb_data(record):
             celery.tracker.report_message(msg, 'warning')
 
 
-def _update_movie_record_imdb_data(record):
-    movie_imdb_data = get_movie_imdb_data(id=record.imdb_data.id)
-    imdb_data = IMDBData.query.get(movie_imdb_data['id'])
-    if imdb_data:
-        record.imdb_data = imdb_data
-    else:
-        for key in movie_imdb_data:
-            setattr(record.imdb_data, key, movie_imdb_data[key])
+def _update_movie_record_imdb_data(record, movie_imdb_data):
+    for key in movie_imdb_data:
+        setattr(record.imdb_data, key, movie_imdb_data[key])
+    record.imdb_data.content_hash = _content_hash(movie_imdb_data)
 
 
-# TODO: There must be a more efficient way to do that
-def _compile_st_dict(st_dict):
-    st_dict['theatre_id'] = Theatre.query.filter(
-        Theatre.st_url_code == st_dict.pop('theatre')
-    ).first().id
+def _set_movie_record_imdb_data(record, movie_imdb_data, imdb_records):
+    record.imdb_data = imdb_records[movie_imdb_data['id']]
+
+
+def _load_imdb_records(imdb_results):
+    """
+    Get IMDB data records for lookup results with one query, adding those
+    not stored yet.
+
+    PK may list a film under several movie ids, which can be enriched by
+    different workers at the same time, so new records are added with
+    add_all_unique.
+
+    :param imdb_results: List of dictionaries with IMDB movie data
+    :return: Dictionary of IMDBData records by id
+    """
+    results = dict((data['id'], data) for data in imdb_results)
+    if not results:
+        return {}
+
+    imdb_records = dict(
+        (imdb_data.id, imdb_data) for imdb_data in
+        IMDBData.query.filter(IMDBData.id.in_(list(results)))
+    )
+    new_records = []
+    for imdb_id, data in results.items():
+        if imdb_id not in imdb_records:
+            imdb_data = IMDBData(**data)
+            imdb_data.content_hash = _content_hash(data)
+            new_records.append(imdb_data)
+    for imdb_data in add_all_unique(db.session, new_records):
+        imdb_records[imdb_data.id] = imdb_data
+    return imdb_records
+
+
+def _imdb_query(record, imdb_id):
+    if imdb_id:
+        return {'id': imdb_id}
+    if record.imdb_data:
+        return {'id': record.imdb_data.id}
+    return {
+        'title': record.url_code.replace('-', ' '),
+        'year': record.show_start.year if record.show_start else None
+    }
 
-    st_dict['technology_id'] = Technology.query.filter(
-        Technology.code == st_dict.pop('technology')
-    ).first().id
 
+def _compile_st_dict(st_dict):
+    st_dict['theatre_id'] = ref_cache.theatre_id(st_dict.pop('theatre'))
+    st_dict['technology_id'] = ref_cache.technology_id(
+        st_dict.pop('technology')
+    )
     return st_dict
 
 
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _sync_movies(movies_data):
+    """
+    Insert new movies and update changed ones.
+
+    Each movie row stores a hash of the PK data it has been written from.
+    Hashes of the fetched movies are read in one query and compared with
+    those of the fetched data, and only movies whose hash differs are
+    written, with a bulk statement per chunk of SYNC_CHUNK_SIZE rows.
+    Unchanged movies are skipped without being loaded at all.
+
+    :param movies_data: List of movie dictionaries from PK data
+    :return: Number of inserted and updated movies
+    """
+    table = Movie.__table__
+
+    existing_hashes = dict(
+        db.session.query(Movie.id, Movie.content_hash).filter(
+            Movie.id.in_([movie['id'] for movie in movies_data])
+        )
+    )
+
+    movies_to_add = []
+    movies_to_update = []
+    for movie in movies_data:
+        movie = dict(movie, content_hash=_content_hash(movie))
+        if movie['id'] not in existing_hashes:
+            log.info('Adding new movie "{}"'.format(movie['url_code']))
+            movies_to_add.append(movie)
+        elif existing_hashes[movie['id']] != movie['content_hash']:
+            log.info('Updating existing movie "{}"'.format(movie['url_code']))
+            movie['m_id'] = movie.pop('id')
+            movies_to_update.append(movie)
+
+    for chunk in _chunks(movies_to_update, SYNC_CHUNK_SIZE):
+        db.session.execute(
+            table.update().where(table.c.id == bindparam('m_id')), chunk
+        )
+
+    for chunk in _chunks(movies_to_add, SYNC_CHUNK_SIZE):
+        db.session.execute(table.insert(), chunk)
+
+    if movies_to_add or movies_to_update:
+        db.session.commit()
+
+    log.info('Movies processed: {}'.format(len(movies_data)))
+    log.info('Skipped movies: {}'.format(
+        len(movies_data) - len(movies_to_add) - len(movies_to_update)
+    ))
+    log.info('Updated movies: {}'.format(len(movies_to_update)))
+    log.info('New movies: {}'.format(len(movies_to_add)))
+
+    return len(movies_to_add) + len(movies_to_update)
+
+
+def _sync_showtimes(showtimes_data, theatre_ids):
+    """
+    Make showtime table match the fetched showtimes.
+
+    Existing showtimes of the theatres whose data has been fetched are read
+    in one query and compared with the fetched ones in memory. Missing
+    showtimes are then inserted, changed ones updated and those no longer
+    present deleted, each with a bulk statement per chunk of
+    SYNC_CHUNK_SIZE rows. Showtimes of other theatres are not touched, so
+    the work done depends on the amount of changed data rather than on
+    the size of the table.
+
+    :param showtimes_data: List of showtime dictionaries from PK data
+    :param theatre_ids: Ids of the theatres showtimes have been fetched for
+    :return: Number of inserted, updated and deleted showtimes
+    """
+    table = ShowTime.__table__
+
+    showtimes_data = [
+        _compile_st_dict(showtime) for showtime in showtimes_data
+    ]
+    fetched_showtimes = dict((st['id'], st) for st in showtimes_data)
+
+    # Showtimes are expected to come from their own theatre's data, but be
+    # prepared for them not to
+    scope = set(theatre_ids)
+    scope.update(st['theatre_id'] for st in showtimes_data)
+
+    existing_showtimes = {}
+    if scope:
+        existing_showtimes = dict(
+            (row.id, row) for row in db.session.execute(
+                table.select().where(table.c.theatre_id.in_(scope))
+            )
+        )
+
+    showtimes_to_add = []
+    showtimes_to_update = []
+    for showtime in showtimes_data:
+        existing = existing_showtimes.get(showtime['id'])
+        if existing is None:
+            showtimes_to_add.append(showtime)
+        elif any(getattr(existing, column) != showtime[column]
+                 for column in SHOWTIME_COLUMNS):
+            showtime = dict(showtime, st_id=showtime['id'])
+            del showtime['id']
+            showtimes_to_update.append(showtime)
+
+    showtimes_to_delete = sorted(
+        st_id for st_id, row in existing_showtimes.items()
+        if st_id not in fetched_showtimes and row.theatre_id in theatre_ids
+    )
+
+    for chunk in _chunks(showtimes_to_delete, SYNC_CHUNK_SIZE):
+        db.session.execute(table.delete().where(table.c.id.in_(chunk)))
+
+    for chunk in _chunks(showtimes_to_update, SYNC_CHUNK_SIZE):
+        db.session.execute(
+            table.update().where(table.c.id == bindparam('st_id')), chunk
+        )
+
+    for chunk in _chunks(showtimes_to_add, SYNC_CHUNK_SIZE):
+        db.session.execute(table.insert(), chunk)
+
+    db.session.commit()
+
+    log.info('Showtimes processed: {}'.format(len(showtimes_data)))
+    log.info('Existing showtimes: {}'.format(len(existing_showtimes)))
+    log.info('New showtimes: {}'.format(len(showtimes_to_add)))
+    log.info('Updated showtimes: {}'.format(len(showtimes_to_update)))
+    log.info('Deleted showtimes: {}'.format(len(showtimes_to_delete)))
+
+    return (len(showtimes_to_add) + len(showtimes_to_update) +
+            len(showtimes_to_delete))
+
+
 def _update_last_fetched(theatres_dict):
-    for theatre in theatres_dict:
-        Theatre.query.get(theatre['id']).last_fetched.date_time = \
-            theatre['last_fetched']
+    fetched_theatres = dict(
+        (th['id'], th) for th in theatres_dict if th['status'] != FETCH_FAILED
+    )
+    if fetched_theatres:
+        for last_fetched in LastFetched.query.filter(
+                LastFetched.theatre_id.in_(list(fetched_theatres))):
+            theatre = fetched_theatres[last_fetched.theatre_id]
+            last_fetched.date_time = theatre['last_fetched']
+            last_fetched.etag = theatre['etag']
     db.session.commit()
 
 
+def _write_schedule_snapshots():
+    """
+    Store schedule of every theatre as a JSON document served by
+    TheatreScheduleAPI.
+
+    Schedule starts at the beginning of current PK local day. It lists
+    days, movies on each day with their IMDB data and showtimes of each
+    movie. Snapshots are added to the current session and are persisted
+    when the caller commits it.
+
+    Snapshots are only to be written from the fetch_pk_data worker, which
+    runs a single process, so that rebuilds never run concurrently and an
+    older rebuild cannot overwrite a newer one.
+
+    :return: Data version snapshots are built from
+    """
+    now = datetime.datetime.utcnow()
+    version = db.session.query(DataVersion.version).filter(
+        DataVersion.id == 1
+    ).scalar()
+    today = utc_to_local_datetime(now).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    showtime_rows = ShowTime.query.with_entities(
+        ShowTime.movie_id, *showtime_serializer.columns
+    ).filter(
+        ShowTime.date_time >= local_to_utc_datetime(today)
+    ).order_by(ShowTime.date_time, ShowTime.id).all()
+
+    movie_ids = list(set(row.movie_id for row in showtime_rows))
+    movies = {}
+    if movie_ids:
+        movies = dict(
+            (row.id, movie_serializer.dump_row(row)) for row in
+            Movie.query.with_entities(*movie_serializer.columns)
+            .filter(Movie.id.in_(movie_ids))
+        )
+        imdb_data = dict(
+            (row.movie_id, imdb_data_serializer.dump_row(row)) for row in
+            db.session.query(
+                Movie.id.label('movie_id'), *imdb_data_serializer.columns
+            ).join(Movie.imdb_data).filter(Movie.id.in_(movie_ids))
+        )
+        for movie_id, movie in movies.items():
+            movie['imdb_data'] = imdb_data.get(movie_id)
+
+    # theatre id -> local date -> movie id -> showtimes
+    schedules = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for row in showtime_rows:
+        showtime = showtime_serializer.dump_row(row)
+        technology = ref_cache.technology(row.technology_id)
+        showtime['technology'] = (
+            technology_serializer.dump_row(technology) if technology
+            else None
+        )
+        day = utc_to_local_datetime(row.date_time).date()
+        schedules[row.theatre_id][day][row.movie_id].append(showtime)
+
+    snapshots = dict(
+        (snapshot.theatre_id, snapshot)
+        for snapshot in ScheduleSnapshot.query
+    )
+    for theatre in ref_cache.theatres():
+        days = schedules.get(theatre.id, {})
+        data = json.dumps({
+            'schedule': {
+                'theatre': theatre_serializer.dump_row(theatre),
+                'days': [
+                    {
+                        'date': day.isoformat(),
+                        'movies': [
+                            dict(movies[movie_id], showtimes=showtimes)
+                            for movie_id, showtimes in sorted(
+                                days[day].items(),
+                                key=lambda item: item[1][0]['date_time']
+                            )
+                        ]
+                    } for day in sorted(days)
+                ]
+            }
+        }, separators=(',', ':'), sort_keys=True)
+        etag = hashlib.md5(data.encode('utf-8')).hexdigest()
+
+        snapshot = snapshots.get(theatre.id)
+        if snapshot is None:
+            db.session.add(ScheduleSnapshot(theatre.id, data, etag, now))
+        elif snapshot.etag != etag:
+            snapshot.data = data
+            snapshot.etag = etag
+            snapshot.generated_at = now
+
+    return version
+
+
+def _retry_failed_theatres(theatres_dict, force, attempt):
+    names = ', '.join(th['en_name'] for th in theatres_dict)
+    if attempt >= current_app.config['PK_FETCH_MAX_RETRIES']:
+        msg = 'Giving up fetching data for {}'.format(names)
+        log.error(msg)
+        celery.tracker.report_message(msg, 'error')
+        return
+
+    countdown = current_app.config['PK_FETCH_RETRY_BACKOFF'] * 2 ** attempt
+    log.warning('Fetching data for {} again in {} seconds'.format(
+        names, countdown
+    ))
+    write_movie_data.s(
+        force, theatre_ids=[th['id'] for th in theatres_dict],
+        attempt=attempt + 1
+    ).apply_async(countdown=countdown)
+
+
 @celery.task
-def write_movie_data(force):
+def write_movie_data(force, theatre_ids=None, attempt=0):
     """
     Create new or update existing movie record in database.
 
+    Theatres that could not be fetched keep their showtimes and are
+    fetched again by a follow-up task with exponential backoff.
+
+    :param force: Forcefully get all data regardless of Last-Modified
+                  header value
+    :param theatre_ids: Only fetch data for theatres with these ids
+    :param attempt: Number of previous attempts to fetch these theatres
     :return:
     """
+    with count_queries(db.engine) as queries:
+        _write_movie_data(force, theatre_ids, attempt)
+    log.info('SQL statements executed: {}'.format(queries.count))
+
+
+def _write_movie_data(force, theatre_ids, attempt):
+    ref_cache.load()
+    http_client.reset_stats()
+
+    theatres = Theatre.query.options(joinedload(Theatre.last_fetched))
+    if theatre_ids:
+        theatres = theatres.filter(Theatre.id.in_(theatre_ids))
     theatres_dict = [
         dict(
             id=th.id,
             en_name=th.en_name,
             url_code=th.url_code,
-            last_fetched=th.last_fetched.date_time
-        ) for th in Theatre.query.all()
+            last_fetched=th.last_fetched.date_time,
+            etag=th.last_fetched.etag
+        ) for th in theatres
     ]
 
-    movies_data, showtimes_data, theatres_data = get_pk_data(theatres_dict,
-                                                             force=force)
+    movies_data, showtimes_data, theatres_data = get_pk_data(
+        theatres_dict,
+        force=force,
+        concurrency=current_app.config['PK_FETCH_CONCURRENCY']
+    )
+
+    failed_theatres = [
+        th for th in theatres_data if th['status'] == FETCH_FAILED
+    ]
+    if failed_theatres:
+        _retry_failed_theatres(failed_theatres, force, attempt)
+
     if not movies_data:
+        # Schedules still need to move on to a new day
+        version = _write_schedule_snapshots()
         _update_last_fetched(theatres_data)
+        _snapshots['version'] = version
         log.info('No updated movie data found')
         return
 
-    existing_movies = Movie.query.count()
-    new_movies = 0
-
     log.info('Updating movies')
-    for movie in movies_data:
-        movie_record = Movie.query.get(movie['id'])
+    changed = _sync_movies(movies_data)
 
-        if movie_record:
-            log.info('Updating existing movie "{}"'.format(movie['url_code']))
-            _update_movie_record(movie_record, movie)
-
-            if movie_record.imdb_data:
-                _update_movie_record_imdb_data(movie_record)
-            else:
-                _insert_movie_record_imdb_data(movie_record)
-        else:
-            log.info('Adding new movie "{}"'.format(movie['url_code']))
-            new_movies += 1
-            _insert_movie_record(movie)
+    # IMDB data is fetched by a separate worker so that it does not delay
+    # showtimes update
+    movie_ids = [movie['id'] for movie in movies_data]
+    batch_size = current_app.config['IMDB_ENRICH_BATCH_SIZE']
+    for i in range(0, len(movie_ids), batch_size):
+        enrich_imdb_data.s(movie_ids[i:i + batch_size]).apply_async()
 
-        db.session.commit()
+    log.info('Updating showtimes')
+    changed += _sync_showtimes(
+        showtimes_data,
+        set(th['id'] for th in theatres_data
+            if th['status'] == FETCH_UPDATED)
+    )
+
+    # Committed together with last fetched times
+    if changed:
+        data_version.bump()
+    version = _write_schedule_snapshots()
+    _update_last_fetched(theatres_data)
+    _snapshots['version'] = version
 
-    log.info('Movies processed: {}'.format(len(movies_data)))
-    log.info('Existing movies: {}'.format(existing_movies))
-    log.info('New movies: {}'.format(new_movies))
+    http_client.log_stats()
 
-    existing_showtimes = ShowTime.query.count()
-    new_showtimes = 0
-    deleted_showtimes = 0
 
-    log.info('Updating showtimes')
-    showtime_ids = [st['id'] for st in showtimes_data]
-    showtimes_to_delete = []
-    showtimes_to_add = []
+@celery.task
+def enrich_imdb_data(movie_ids, imdb_id=None):
+    """
+    Set or update IMDB data of movies.
 
-    for showtime in ShowTime.query.all():
-        if showtime.id not in showtime_ids:
-            showtimes_to_delete.append(showtime.id)
-            deleted_showtimes += 1
-    for showtime in showtimes_data:
-        if not ShowTime.query.get(showtime['id']):
-            showtimes_to_add.append(ShowTime(**_compile_st_dict(showtime)))
-            new_showtimes += 1
-
-    if showtimes_to_delete:
-        ShowTime.query.filter(
-            ShowTime.id.in_(showtimes_to_delete)
-        ).delete(
-            synchronize_session=False
+    :param movie_ids: List of movie ids
+    :param imdb_id: Use IMDB data with this id instead of searching IMDB
+                    by movie title
+    :return:
+    """
+    imdb_cache.reset_stats()
+    http_client.reset_stats()
+
+    with count_queries(db.engine) as queries:
+        # Movies are committed together, as a commit would expire the ones
+        # not processed yet and load each of them again
+        movie_records = Movie.query.options(
+            joinedload(Movie.imdb_data), joinedload(Movie.meta)
+        ).filter(Movie.id.in_(movie_ids)).all()
+
+        # IMDB is queried for all movies up front, concurrently
+        imdb_results = imdb_cache.get_many_movie_imdb_data(
+            [_imdb_query(record, imdb_id) for record in movie_records],
+            concurrency=current_app.config['IMDB_FETCH_CONCURRENCY']
         )
 
-    if showtimes_to_add:
-        db.session.add_all(showtimes_to_add)
+        # Records of IMDB data to be linked to movies, loaded at once
+        imdb_records = _load_imdb_records([
+            movie_imdb_data for movie_record, movie_imdb_data in
+            zip(movie_records, imdb_results)
+            if movie_imdb_data and (imdb_id or not movie_record.imdb_data)
+        ])
+
+        skipped = updated = inserted = 0
+        for movie_record, movie_imdb_data in zip(movie_records,
+                                                 imdb_results):
+            if movie_imdb_data is None:
+                # Lookup failed, keep current data until the next run
+                continue
+            # Unchanged data is not written, so that the record is not
+            # flushed and nothing is invalidated
+            if (not imdb_id and movie_record.imdb_data and
+                    movie_record.imdb_data.content_hash ==
+                    _content_hash(movie_imdb_data)):
+                skipped += 1
+                continue
+            log.info('Updating IMDB data for movie "{}"'.format(
+                movie_record.url_code
+            ))
+            if imdb_id:
+                _set_movie_record_imdb_data(movie_record, movie_imdb_data,
+                                            imdb_records)
+                updated += 1
+            elif movie_record.imdb_data:
+                _update_movie_record_imdb_data(movie_record, movie_imdb_data)
+                updated += 1
+            else:
+                _insert_movie_record_imdb_data(movie_record, movie_imdb_data,
+                                               imdb_records)
+                if movie_imdb_data:
+                    inserted += 1
+
+        version = None
+        if updated or inserted:
+            version = data_version.bump()
+        # IMDB cache entries may have been added even if no movie changed
+        db.session.commit()
 
-    db.session.commit()
+    if version is not None:
+        write_schedule_snapshots.s(version).apply_async()
 
-    log.info('Showtimes processed: {}'.format(len(showtimes_data)))
-    log.info('Existing showtimes: {}'.format(existing_showtimes))
-    log.info('New showtimes: {}'.format(new_showtimes))
-    log.info('Deleted showtimes: {}'.format(deleted_showtimes))
+    log.info('Skipped IMDB data: {}'.format(skipped))
+    log.info('Updated IMDB data: {}'.format(updated))
+    log.info('New IMDB data: {}'.format(inserted))
+    log.info('IMDB cache hits: {}'.format(imdb_cache.stats['hits']))
+    log.info('IMDB cache misses: {}'.format(imdb_cache.stats['misses']))
+    log.info('SQL statements executed: {}'.format(queries.count))
+    http_client.log_stats()
 
-    _update_last_fetched(theatres_data)
+
+@celery.task
+def write_schedule_snapshots(version=None):
+    """
+    Rebuild schedule snapshots.
+
+    Enrichment batches finishing close to each other all ask for a rebuild,
+    so it is skipped if snapshots have been committed for the given data
+    version or a later one already.
+
+    :param version: Data version the rebuild is asked for
+    :return:
+    """
+    if (version is not None and _snapshots['version'] is not None and
+            _snapshots['version'] >= version):
+        log.info('Schedule snapshots are up to date with data version {}'
+                 .format(version))
+        return
+
+    version = _write_schedule_snapshots()
+    db.session.commit()
+    _snapshots['version'] = version
 
 
 @celery.task
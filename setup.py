@@ -20,6 +20,7 @@ setup(
         'flask-migrate',
         'flask-restful',
         'flask-sqlalchemy',
+        'SQLAlchemy>=1.2,<1.4',
         'flask-jwt',
         'blinker',
         'webargs',
@@ -27,7 +28,6 @@ setup(
         'itsdangerous',
         'requests',
         'PyMySQL',
-        'xmltodict',
         'rollbar',
         'lxml'
     ]
@@ -0,0 +1,6 @@
+import os
+
+# Configuration is read when clapperboard is first imported
+os.environ['CLPBRD_CONFIG'] = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config.py'
+)
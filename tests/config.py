@@ -0,0 +1,13 @@
+# Settings tests run with, on top of clapperboard.config
+ENVIRONMENT = 'test'
+DEBUG = False
+TESTING = True
+SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+# Every request reads the database
+RESPONSE_CACHE_BACKEND = None
+DATA_VERSION_CHECK_INTERVAL = 0
+USER_CACHE_TTL = 0
+
+# Tasks run in the test process
+CELERY_ALWAYS_EAGER = True
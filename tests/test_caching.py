@@ -0,0 +1,34 @@
+from tests.utils import APITestCase
+
+
+class ConditionalTest(APITestCase):
+    def setUp(self):
+        super(ConditionalTest, self).setUp()
+        self.add_movies(2)
+
+    def test_private(self):
+        for url in ('/showtimes', '/movies', '/theatres', '/technologies',
+                    '/showtimes/11'):
+            resp = self.get(url)
+            self.assertTrue(
+                resp.headers['Cache-Control'].startswith('private, '), url
+            )
+            self.assertEqual(resp.vary.as_set(), set(['authorization']))
+
+    def test_pretty_etag(self):
+        compact = self.get('/showtimes')
+        pretty = self.get('/showtimes?pretty=1')
+
+        self.assertNotEqual(compact.headers['ETag'], pretty.headers['ETag'])
+        resp = self.get('/showtimes?pretty=1',
+                        headers={'If-None-Match': compact.headers['ETag']})
+        self.assertEqual(resp.status_code, 200)
+        resp = self.get('/showtimes?pretty=1',
+                        headers={'If-None-Match': pretty.headers['ETag']})
+        self.assertEqual(resp.status_code, 304)
+
+    def test_time_relative_etag(self):
+        resp = self.get('/showtimes?starting_within_days=1&pretty=1')
+
+        self.assertRegexpMatches(resp.headers['ETag'],
+                                 r'^"v\d+-t\d+-pretty"$')
@@ -0,0 +1,79 @@
+import time
+import unittest
+
+import requests
+
+from clapperboard.client.clap_client import ClapClient
+from tests.utils import StubServer
+
+
+class ClapClientTest(unittest.TestCase):
+    def setUp(self):
+        self.client = ClapClient()
+        self.client.max_retries = 2
+        self.client.backoff_factor = 0
+        self.client.read_timeout = 0.2
+
+    def serve(self, routes):
+        server = StubServer(routes).__enter__()
+        self.addCleanup(server.__exit__)
+        return server
+
+    def test_retries_server_errors(self):
+        responses = [(503, {}, b'', 0), (503, {}, b'', 0), (200, {}, b'ok', 0)]
+        server = self.serve({'/': lambda: responses.pop(0)})
+
+        resp = self.client.get(server.url + '/')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.text, 'ok')
+        self.assertEqual(len(server.requests), 3)
+
+    def test_gives_up_after_retries(self):
+        server = self.serve({'/': (503, {}, b'', 0)})
+
+        with self.assertRaises(requests.exceptions.RetryError):
+            self.client.get(server.url + '/')
+        self.assertEqual(len(server.requests), 1 + self.client.max_retries)
+        host = server.url.split('//')[1]
+        self.assertEqual(self.client.stats[host]['requests'], 3)
+
+    def test_does_not_retry_post(self):
+        server = self.serve({'/': (503, {}, b'', 0)})
+
+        resp = self.client.post(server.url + '/', data={'to': 'user'})
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_timeout(self):
+        self.client.max_retries = 0
+        server = self.serve({'/': (200, {}, b'', 1)})
+
+        start = time.time()
+        with self.assertRaises(requests.Timeout):
+            self.client.get(server.url + '/')
+        self.assertLess(time.time() - start, 1)
+
+    def test_retries_timeouts(self):
+        responses = [(200, {}, b'late', 1), (200, {}, b'ok', 0)]
+        server = self.serve({'/': lambda: responses.pop(0)})
+
+        resp = self.client.get(server.url + '/')
+
+        self.assertEqual(resp.text, 'ok')
+        self.assertEqual(len(server.requests), 2)
+
+    def test_rate_limit_applies_to_retries(self):
+        server = self.serve({'/': (503, {}, b'', 0)})
+        host = server.url.split('//')[1]
+        self.client.rate_limits = {host: 10}
+
+        start = time.time()
+        with self.assertRaises(requests.exceptions.RetryError):
+            self.client.get(server.url + '/')
+
+        # Three requests 0.1 seconds apart, measured by the client as
+        # arrival times at the server jitter under load
+        self.assertEqual(len(server.requests), 3)
+        self.assertGreaterEqual(time.time() - start, 0.19)
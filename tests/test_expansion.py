@@ -0,0 +1,72 @@
+import json
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from clapperboard import app
+from tests.utils import APITestCase
+
+
+class MovieExpansionTest(APITestCase):
+    def setUp(self):
+        super(MovieExpansionTest, self).setUp()
+        # Each movie has a showtime in theatres 1 and 2
+        self.add_movies(3)
+
+    def get_json(self, url):
+        # Test client ignores query string of absolute URLs
+        url = url.replace('http://localhost', '')
+        resp = self.get(url)
+        self.assertEqual(resp.status_code, 200, url)
+        return json.loads(resp.get_data(as_text=True))
+
+    def showtime_ids(self, movie):
+        return [showtime['id'] for showtime in movie['showtimes']]
+
+    def test_requires_showtimes(self):
+        for expand in ('theatre', 'technology', 'imdb_data,theatre'):
+            resp = self.get('/movies?expand={}'.format(expand))
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(
+                json.loads(resp.get_data(as_text=True))['message'],
+                'Expanding "theatre" and "technology" requires "showtimes"'
+            )
+
+        movies = self.get_json('/movies?expand=showtimes,theatre')['movies']
+        self.assertEqual(movies[0]['showtimes'][0]['theatre']['id'], 1)
+
+    def test_showtimes_within_limit(self):
+        movies = self.get_json('/movies?expand=showtimes')['movies']
+
+        self.assertEqual([self.showtime_ids(movie) for movie in movies],
+                         [[11, 12], [21, 22], [31, 32]])
+        for movie in movies:
+            self.assertNotIn('showtimes_next', movie)
+
+    def test_showtimes_cut_off(self):
+        with mock.patch.dict(app.config, API_MAX_EXPANDED_SHOWTIMES=3):
+            movies = self.get_json('/movies?expand=showtimes')['movies']
+
+        self.assertEqual([self.showtime_ids(movie) for movie in movies],
+                         [[11, 12], [21], []])
+        self.assertNotIn('showtimes_next', movies[0])
+        rest = [
+            [showtime['id'] for showtime in
+             self.get_json(movie['showtimes_next'])['showtimes']]
+            for movie in movies[1:]
+        ]
+        self.assertEqual(rest, [[22], [31, 32]])
+
+    def test_showtimes_next_filtered(self):
+        with mock.patch.dict(app.config, API_MAX_EXPANDED_SHOWTIMES=2):
+            movies = self.get_json(
+                '/movies?expand=showtimes&theatre_id=2'
+            )['movies']
+
+        self.assertEqual([self.showtime_ids(movie) for movie in movies],
+                         [[12], [22], []])
+        self.assertIn('theatre_id=2', movies[2]['showtimes_next'])
+        showtimes = self.get_json(movies[2]['showtimes_next'])['showtimes']
+        self.assertEqual([showtime['id'] for showtime in showtimes], [32])
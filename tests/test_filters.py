@@ -0,0 +1,45 @@
+import json
+
+from tests.utils import APITestCase
+
+
+class FilterArgsTest(APITestCase):
+    def setUp(self):
+        super(FilterArgsTest, self).setUp()
+        self.add_movies(2)
+
+    def assert_rejected(self, url, message):
+        resp = self.get(url)
+        self.assertEqual(resp.status_code, 400, url)
+        self.assertEqual(json.loads(resp.get_data(as_text=True))['message'],
+                         message)
+
+    def test_days(self):
+        resp = self.get('/showtimes?starting_within_days=365')
+        self.assertEqual(resp.status_code, 200)
+        for days in (0, 366, 10000000):
+            for url in ('/showtimes', '/movies'):
+                self.assert_rejected(
+                    '{}?starting_within_days={}'.format(url, days),
+                    'Number of days must be between 1 and 365'
+                )
+
+    def test_date_out_of_range(self):
+        for date in ('9999-12-31', '0001-01-01'):
+            for url in ('/showtimes', '/movies'):
+                for arg in ('date_from', 'date_to'):
+                    self.assert_rejected(
+                        '{}?{}={}'.format(url, arg, date),
+                        'Date {} is out of range'.format(date)
+                    )
+        resp = self.get('/showtimes?date_from=1900-01-01&date_to=2999-12-31')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            len(json.loads(resp.get_data(as_text=True))['showtimes']), 4
+        )
+
+    def test_invalid_date(self):
+        self.assert_rejected(
+            '/showtimes?date_to=2015-02-30',
+            'Invalid date 2015-02-30, expected format is YYYY-MM-DD'
+        )
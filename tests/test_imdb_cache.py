@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from clapperboard import app
+from clapperboard.cache import imdb_cache
+from clapperboard.client import http_client
+from clapperboard.common import utils
+from clapperboard.models import db
+from clapperboard.models.imdb_cache_entry import IMDBCacheEntry
+from tests.utils import DatabaseTestCase, StubServer
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'imdb')
+MOVIE_IDS = (816692, 2562232, 4287320)
+# Seconds each IMDB page takes to be served
+DELAY = 0.2
+
+
+def read_page(name):
+    with io.open(os.path.join(FIXTURES_DIR, name + '.html'), 'rb') as f:
+        return f.read()
+
+
+def imdb_routes(delay=0):
+    """Recorded IMDB pages by path, as requested by get_movie_imdb_data."""
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    routes = dict(
+        ('/title/tt{}'.format(movie_id),
+         (200, headers, read_page('title_tt{:07d}'.format(movie_id)), delay))
+        for movie_id in MOVIE_IDS
+    )
+    for title in ('interstellar', 'nothing'):
+        routes['/find?q={}&&s=tt&&ttype=ft'.format(title)] = (
+            200, headers, read_page('find_{}'.format(title)), delay
+        )
+    return routes
+
+
+class StubIMDBMixin(object):
+    def serve_imdb(self, delay=0, rate_limit=None):
+        self.server = StubServer(imdb_routes(delay)).__enter__()
+        self.addCleanup(self.server.__exit__)
+        host = self.server.url.split('//')[1]
+        for patcher in (
+                mock.patch.object(utils, 'IMDB_URL', self.server.url),
+                mock.patch.object(http_client, 'rate_limits',
+                                  {host: rate_limit})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class GetManyMovieIMDBDataTest(StubIMDBMixin, DatabaseTestCase):
+    def setUp(self):
+        super(GetManyMovieIMDBDataTest, self).setUp()
+        self.serve_imdb()
+
+    def test_lookups(self):
+        results = imdb_cache.get_many_movie_imdb_data([
+            {'id': 2562232},
+            {'title': 'interstellar'},
+            {'title': 'nothing'},
+            # Not found on IMDB
+            {'id': 1},
+            {'id': 4287320},
+        ], concurrency=4)
+
+        self.assertEqual(results[0]['title'],
+                         u'Birdman or (The Unexpected Virtue of Ignorance)')
+        self.assertEqual(results[0]['director'], u'Alejandro G. Iñárritu')
+        self.assertEqual(results[1]['id'], 816692)
+        self.assertEqual(results[1]['rating'], 8.7)
+        self.assertEqual(results[1]['genre'], u'Adventure, Drama, Sci-Fi')
+        self.assertEqual(results[2], {})
+        self.assertIsNone(results[3])
+        self.assertEqual(results[4]['country'], u'')
+        self.assertIsNone(results[4]['runtime'])
+
+    def test_cached(self):
+        queries = [{'id': 2562232}, {'title': 'interstellar'},
+                   {'title': 'nothing'}]
+        results = imdb_cache.get_many_movie_imdb_data(queries, concurrency=4)
+        db.session.commit()
+        request_count = len(self.server.requests)
+
+        self.assertEqual(
+            imdb_cache.get_many_movie_imdb_data(queries, concurrency=4),
+            results
+        )
+        self.assertEqual(len(self.server.requests), request_count)
+        self.assertEqual(IMDBCacheEntry.query.count(), 4)
+
+    def test_same_movie_fetched_once(self):
+        results = imdb_cache.get_many_movie_imdb_data(
+            [{'id': 816692}, {'id': 816692}], concurrency=4
+        )
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class ConcurrencyTest(StubIMDBMixin, DatabaseTestCase):
+    queries = [{'id': movie_id} for movie_id in MOVIE_IDS]
+
+    def fetch(self, concurrency):
+        start = time.time()
+        imdb_cache.get_many_movie_imdb_data(self.queries,
+                                            concurrency=concurrency)
+        return time.time() - start
+
+    def test_concurrent(self):
+        self.serve_imdb(DELAY)
+        self.assertLess(self.fetch(len(self.queries)), DELAY * 2)
+
+    def test_rate_limit(self):
+        # Requests are sent 0.3 seconds apart however fast IMDB answers
+        self.serve_imdb(rate_limit=3)
+        self.assertGreaterEqual(self.fetch(len(self.queries)), 0.6)
+
+
+@pytest.fixture
+def stub_imdb():
+    with StubServer(imdb_routes(DELAY)) as server:
+        with app.app_context():
+            db.create_all()
+            with mock.patch.object(utils, 'IMDB_URL', server.url):
+                yield server
+            db.session.remove()
+            db.drop_all()
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+@pytest.mark.benchmark(group='imdb-lookups')
+def test_benchmark_get_many_movie_imdb_data(benchmark, stub_imdb,
+                                            concurrency):
+    queries = [{'id': movie_id} for movie_id in MOVIE_IDS]
+    queries.append({'title': 'interstellar'})
+
+    def clear_cache():
+        db.session.rollback()
+        IMDBCacheEntry.query.delete()
+        db.session.commit()
+
+    benchmark.pedantic(
+        imdb_cache.get_many_movie_imdb_data, args=(queries, concurrency),
+        setup=clear_cache, rounds=3
+    )
@@ -0,0 +1,61 @@
+import os
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from clapperboard.common import imdb_dataset
+from clapperboard.models import db
+from tests.utils import DatabaseTestCase
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'imdb_dataset')
+
+
+class ImportDatasetTest(DatabaseTestCase):
+    def import_rows(self):
+        """
+        Run import_dataset, collecting rows it would insert by table, as
+        the staging tables can only be made in MySQL.
+        """
+        rows = {}
+
+        def import_dump(path, table, convert, chunk_size):
+            rows[table.name] = [
+                values for values in map(convert,
+                                         imdb_dataset._read_dump(path))
+                if values is not None
+            ]
+
+        dialect = db.engine.dialect
+        with mock.patch.object(dialect, 'name', 'mysql'), \
+                mock.patch.object(imdb_dataset, '_import_dump',
+                                  import_dump), \
+                mock.patch.object(imdb_dataset, '_swap_tables'):
+            imdb_dataset.import_dataset(FIXTURES_DIR, 100)
+        return rows
+
+    def test_filtered(self):
+        rows = self.import_rows()
+
+        self.assertEqual([row['id'] for row in rows['imdb_title']],
+                         [816692, 2562232])
+        self.assertEqual([row['title_id'] for row in rows['imdb_rating']],
+                         [816692, 2562232])
+        self.assertEqual(
+            [(row['title_id'], row['name_id'], row['category'])
+             for row in rows['imdb_principal']],
+            [(816692, 190, 'actor'), (816692, 634240, 'director'),
+             (2562232, 474, 'actor'), (2562232, 327944, 'director')]
+        )
+        # Only directors and cast of imported titles
+        self.assertEqual(sorted(row['id'] for row in rows['imdb_name']),
+                         [190, 474, 327944, 634240])
+
+    def test_requires_mysql(self):
+        with mock.patch.object(imdb_dataset, '_import_dump') as import_dump:
+            with self.assertRaises(RuntimeError):
+                imdb_dataset.import_dataset(FIXTURES_DIR, 100)
+        self.assertFalse(import_dump.called)
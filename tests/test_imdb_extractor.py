@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import sys
+import unittest
+
+import pytest
+from lxml import html as lh
+
+from clapperboard.common.imdb_extractor import (
+    extract_movie,
+    extract_movie_id,
+    IMDBRecord
+)
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'imdb')
+MOVIE_IDS = (816692, 2562232, 4287320)
+
+
+def read_page(name):
+    with io.open(os.path.join(FIXTURES_DIR, name + '.html'),
+                 encoding='utf-8') as f:
+        return f.read()
+
+
+def title_page(movie_id):
+    return read_page('title_tt{:07d}'.format(movie_id))
+
+
+def extract_with_document_xpath(html, movie_id):
+    """
+    Extract movie data the way get_movie_imdb_data did before extraction
+    was compiled, each field searched for in the whole document.
+    """
+    movie_details_box = "//div[@id='titleDetails']/div"
+    lh_doc = lh.fromstring(html)
+    title = lh_doc.xpath(
+        "//td[@id='overview-top']/h1/span[@itemprop='name']/text()"
+    )
+    rating = lh_doc.xpath(
+        "//div[@class='titlePageSprite star-box-giga-star']/text()"
+    )
+    genre = lh_doc.xpath("//div[@itemprop='genre']/a/text()")
+    director = lh_doc.xpath("//div[@itemprop='director']/a/span/text()")
+    cast = lh_doc.xpath(
+        "//table[@class='cast_list']/tr[position() >= 2 and position() <= 11]"
+        "/td[@itemtype='http://schema.org/Person']/a/span/text()"
+    )
+    country = lh_doc.xpath(
+        "{}/h4[text()='Country:']/../a/text()".format(movie_details_box)
+    )
+    runtime = lh_doc.xpath("{}/time/text()".format(movie_details_box))
+    return IMDBRecord(
+        id=movie_id,
+        title=title[0],
+        rating=float(rating[0].strip()) if rating else None,
+        genres=[g.strip() for g in genre],
+        countries=country,
+        directors=director,
+        cast=cast,
+        runtime=int(runtime[0].split(' ')[0]) if runtime else None
+    )
+
+
+class ExtractMovieTest(unittest.TestCase):
+    def test_full_page(self):
+        record = extract_movie(title_page(816692), 816692)
+
+        self.assertEqual(record.title, u'Interstellar')
+        self.assertEqual(record.rating, 8.7)
+        self.assertEqual(record.genres, [u'Adventure', u'Drama', u'Sci-Fi'])
+        self.assertEqual(record.countries, [u'USA', u'UK'])
+        self.assertEqual(record.directors, [u'Christopher Nolan'])
+        self.assertEqual(record.runtime, 169)
+        # Only the first ten billed
+        self.assertEqual(len(record.cast), 10)
+        self.assertEqual(record.cast[4], u'Timothée Chalamet')
+
+    def test_missing_blocks(self):
+        record = extract_movie(title_page(4287320), 4287320)
+
+        self.assertEqual(record, IMDBRecord(
+            id=4287320, title=u'Короткий метр', rating=None, genres=[],
+            countries=[], directors=[u'Режисер Перший', u'Режисер Другий'],
+            cast=[], runtime=None
+        ))
+
+    def test_no_title(self):
+        with self.assertRaises(ValueError):
+            extract_movie(read_page('find_interstellar'), 1)
+
+    def test_same_as_document_xpath(self):
+        for movie_id in MOVIE_IDS:
+            page = title_page(movie_id)
+            self.assertEqual(extract_movie(page, movie_id),
+                             extract_with_document_xpath(page, movie_id))
+
+    def test_movie_id(self):
+        self.assertEqual(extract_movie_id(read_page('find_interstellar')),
+                         816692)
+        self.assertIsNone(extract_movie_id(read_page('find_nothing')))
+
+
+@pytest.mark.skipif(tracemalloc is None, reason='requires tracemalloc')
+@pytest.mark.parametrize('movie_id', MOVIE_IDS)
+def test_allocations(movie_id):
+    page = title_page(movie_id)
+    peaks = []
+    for extract in (extract_movie, extract_with_document_xpath):
+        tracemalloc.start()
+        try:
+            extract(page, movie_id)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    sys.stdout.write('\nPeak Python allocations for tt{}: compiled {} B, '
+                     'document XPath {} B\n'.format(movie_id, *peaks))
+
+
+@pytest.mark.parametrize('movie_id', MOVIE_IDS)
+@pytest.mark.benchmark(group='extract-movie')
+def test_benchmark_extract_movie(benchmark, movie_id):
+    benchmark(extract_movie, title_page(movie_id), movie_id)
+
+
+@pytest.mark.parametrize('movie_id', MOVIE_IDS)
+@pytest.mark.benchmark(group='extract-movie')
+def test_benchmark_document_xpath(benchmark, movie_id):
+    benchmark(extract_with_document_xpath, title_page(movie_id), movie_id)
@@ -0,0 +1,46 @@
+import json
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.resources import movie
+from clapperboard.workers.tasks import _content_hash
+from tests.utils import APITestCase
+
+
+MOVIE_IMDB_DATA = dict(id=816692, title='Interstellar',
+                       genre='Adventure, Drama, Sci-Fi', country='USA, UK',
+                       director='Christopher Nolan',
+                       cast='Matthew McConaughey', runtime=169, rating=8.7)
+
+
+class MovieIMDBDataPutTest(APITestCase):
+    def setUp(self):
+        super(MovieIMDBDataPutTest, self).setUp()
+        self.add_movies(1)
+        for patcher in (
+                mock.patch.object(movie.imdb_cache, 'get_movie_imdb_data',
+                                  return_value=dict(MOVIE_IMDB_DATA)),
+                mock.patch.object(movie, 'write_schedule_snapshots')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def put(self, imdb_id):
+        return self.request(
+            'PUT', '/movies/1/imdb-data',
+            data=json.dumps(dict(imdb_data=dict(id=imdb_id))),
+            content_type='application/json'
+        )
+
+    def test_content_hash(self):
+        resp = self.put(816692)
+
+        self.assertEqual(resp.status_code, 200)
+        imdb_data = IMDBData.query.get(816692)
+        self.assertEqual(imdb_data.title, 'Interstellar')
+        # Next sync sees the record as up to date
+        self.assertEqual(imdb_data.content_hash,
+                         _content_hash(MOVIE_IMDB_DATA))
@@ -0,0 +1,149 @@
+import os
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from clapperboard.common import utils
+from clapperboard.common.utils import (
+    get_pk_data,
+    FETCH_UPDATED,
+    FETCH_FAILED
+)
+from tests.utils import StubServer
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'pk')
+LAST_MODIFIED = 'Sat, 07 Mar 2015 08:00:00 GMT'
+# Slowest theatre takes this many seconds to answer
+DELAY = 0.3
+
+
+def read_feed(name):
+    with open(os.path.join(FIXTURES_DIR, '{}.xml'.format(name)), 'rb') as f:
+        return f.read()
+
+
+def feed_route(body, delay=0):
+    return (200, {'Last-Modified': LAST_MODIFIED, 'Content-Type': 'text/xml'},
+            body, delay)
+
+
+def feed_path(url_code):
+    return '/{}/showtimes/xml/'.format(url_code)
+
+
+def make_theatres(*url_codes):
+    return [dict(en_name=url_code, url_code=url_code, last_fetched=None,
+                 etag=None) for url_code in url_codes]
+
+
+class StubServerMixin(object):
+    def start_server(self, routes):
+        self.server = StubServer(routes).__enter__()
+        self.addCleanup(self.server.__exit__)
+        patcher = mock.patch.object(
+            utils, 'PK_SHOWTIMES_URL',
+            self.server.url + feed_path('{}')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class GetPKDataTest(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        # A theatre answering with a movie and then breaking off
+        truncated = (
+            b'<planeta-kino><movies><movie id="2001" '
+            b'url="http://planeta-kino.com.ua/lvov/movies/foxcatcher/">'
+            b'<title>Foxcatcher</title><dt-start>2015-03-01</dt-start>'
+            b'<dt-end/></movie><mov'
+        )
+        self.start_server({
+            # The first theatre answers last
+            feed_path('kiev'): feed_route(read_feed('kiev'), DELAY),
+            feed_path('lvov'): feed_route(truncated),
+            feed_path('odessa'): feed_route(read_feed('odessa')),
+        })
+
+    def fetch(self, concurrency):
+        theatres = make_theatres('kiev', 'kharkov', 'odessa', 'lvov')
+        return get_pk_data(theatres, True, concurrency=concurrency)
+
+    def test_merged_in_theatre_order(self):
+        movies, showtimes, theatres = self.fetch(4)
+
+        self.assertEqual([movie['id'] for movie in movies],
+                         [1001, 1002, 1003, 1004])
+        self.assertEqual(
+            [showtime['id'] for showtime in showtimes],
+            [50001, 50002, 50003, 50004, 50005, 60001, 60002, 60003]
+        )
+        self.assertEqual([movie['url_code'] for movie in movies],
+                         ['interstellar', 'birdman', 'whiplash', 'selma'])
+
+    def test_failed_theatres(self):
+        _, _, theatres = self.fetch(4)
+
+        # Not found and a broken document
+        self.assertEqual(
+            [theatre['status'] for theatre in theatres],
+            [FETCH_UPDATED, FETCH_FAILED, FETCH_UPDATED, FETCH_FAILED]
+        )
+        self.assertIsNone(theatres[1]['last_fetched'])
+        self.assertIsNone(theatres[3]['last_fetched'])
+
+    def test_same_as_serial(self):
+        self.assertEqual(self.fetch(4), self.fetch(1))
+
+
+class ConcurrencyTest(StubServerMixin, unittest.TestCase):
+    url_codes = ('kiev', 'odessa', 'kharkov', 'lvov')
+
+    def setUp(self):
+        body = read_feed('kiev')
+        self.start_server(dict(
+            (feed_path(url_code), feed_route(body, DELAY))
+            for url_code in self.url_codes
+        ))
+
+    def fetch(self, concurrency):
+        start = time.time()
+        get_pk_data(make_theatres(*self.url_codes), True,
+                    concurrency=concurrency)
+        return time.time() - start
+
+    def test_takes_as_long_as_slowest_theatre(self):
+        self.assertLess(self.fetch(len(self.url_codes)), DELAY * 2)
+
+    def test_serial(self):
+        self.assertGreaterEqual(self.fetch(1), DELAY * len(self.url_codes))
+
+
+@pytest.fixture
+def pk_server():
+    body = read_feed('kiev')
+    routes = dict(
+        (feed_path(url_code), feed_route(body, DELAY))
+        for url_code in ConcurrencyTest.url_codes
+    )
+    with StubServer(routes) as server:
+        with mock.patch.object(utils, 'PK_SHOWTIMES_URL',
+                               server.url + feed_path('{}')):
+            yield server
+
+
+@pytest.mark.parametrize('concurrency', [1, 2, 4])
+@pytest.mark.benchmark(group='get_pk_data')
+def test_benchmark_get_pk_data(benchmark, pk_server, concurrency):
+    benchmark.pedantic(
+        lambda: get_pk_data(make_theatres(*ConcurrencyTest.url_codes), True,
+                            concurrency=concurrency),
+        rounds=3
+    )
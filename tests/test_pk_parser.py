@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+import pytest
+import xmltodict
+
+from clapperboard.common.utils import (
+    iter_pk_records,
+    _string_to_utc_datetime,
+    PK_MOVIE
+)
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'pk')
+
+ORDER_URL = 'https://cabinet.planeta-kino.com.ua/hall/?show_id={}&amp;x=1'
+
+
+def parse_with_xmltodict(xml_data):
+    """
+    Parse PK showtimes XML document the way get_pk_data did before it
+    parsed documents incrementally.
+    """
+    order_url_pattern = (
+        r"^https:\/\/cabinet.planeta-kino.com.ua\/hall\/\?show_id=(\d+)&.*$"
+    )
+    movies = []
+    showtimes = []
+    seen_movies = set()
+
+    data_dict = xmltodict.parse(xml_data, dict_constructor=dict)
+    location_data = data_dict['planeta-kino']
+    movies_data = location_data['movies']['movie']
+    showtimes_data = location_data['showtimes']['day']
+
+    if not isinstance(showtimes_data, list):
+        showtimes_data = [showtimes_data]
+
+    for pk_movie in movies_data:
+        if pk_movie['@id'] not in seen_movies:
+            movie = dict(
+                id=int(pk_movie['@id']),
+                title=pk_movie['title'],
+                url_code=pk_movie['@url'].split('/')[-2],
+                show_start=_string_to_utc_datetime(pk_movie['dt-start']),
+                show_end=_string_to_utc_datetime(pk_movie['dt-end'])
+            )
+            movies.append(movie)
+            seen_movies.add(pk_movie['@id'])
+
+    for day in showtimes_data:
+        if not day or 'show' not in day:
+            continue
+        if not isinstance(day['show'], list):
+            day['show'] = [day['show']]
+        for pk_showtime in day['show']:
+            if pk_showtime['@order-url']:
+                showtime = dict(
+                    id=int(re.match(order_url_pattern,
+                                    pk_showtime['@order-url']).group(1)),
+                    theatre=pk_showtime['@theatre-id'],
+                    hall_id=int(pk_showtime['@hall-id']),
+                    technology=pk_showtime['@technology'],
+                    date_time=_string_to_utc_datetime(
+                        pk_showtime['@full-date']
+                    ),
+                    order_url=pk_showtime['@order-url'],
+                    movie_id=int(pk_showtime['@movie-id'])
+                )
+                showtimes.append(showtime)
+
+    return movies, showtimes
+
+
+def parse_with_iterparse(source):
+    movies = []
+    showtimes = []
+    for record_type, record in iter_pk_records(source):
+        if record_type == PK_MOVIE:
+            movies.append(record)
+        else:
+            showtimes.append(record)
+    return movies, showtimes
+
+
+def make_feed(movie_count, day_count, shows_per_day):
+    """Make a PK showtimes XML document of the given size."""
+    parts = [u'<?xml version="1.0" encoding="UTF-8"?>\n<planeta-kino>',
+             u'<movies>']
+    for movie_id in range(1, movie_count + 1):
+        parts.append(
+            u'<movie id="{0}" url="http://planeta-kino.com.ua/kiev/movies/'
+            u'movie-{0}/"><title>Фільм {0}</title>'
+            u'<dt-start>2015-03-01</dt-start><dt-end>2015-03-31</dt-end>'
+            u'</movie>'.format(movie_id)
+        )
+    parts.append(u'</movies><showtimes>')
+    show_id = 0
+    for day in range(1, day_count + 1):
+        parts.append(u'<day date="2015-03-{:02d}">'.format(day))
+        for show in range(shows_per_day):
+            show_id += 1
+            parts.append(
+                u'<show movie-id="{}" theatre-id="pk-kiev" hall-id="{}" '
+                u'technology="2d" full-date="2015-03-{:02d} {:02d}:{:02d}:00" '
+                u'order-url="{}"/>'.format(
+                    show % movie_count + 1, show % 10 + 1, day,
+                    show * 17 // 60 % 24, show * 17 % 60,
+                    ORDER_URL.format(show_id)
+                )
+            )
+        parts.append(u'</day>')
+    parts.append(u'</showtimes></planeta-kino>')
+    return u''.join(parts).encode('utf-8')
+
+
+class IterParseTest(unittest.TestCase):
+    def assertSameRecords(self, xml_data):
+        self.assertEqual(parse_with_iterparse(io.BytesIO(xml_data)),
+                         parse_with_xmltodict(xml_data.decode('utf-8')))
+
+    def test_fixture_feeds(self):
+        for name in ('kiev', 'odessa'):
+            with open(os.path.join(FIXTURES_DIR, name + '.xml'), 'rb') as f:
+                self.assertSameRecords(f.read())
+
+    def test_fixture_records(self):
+        with open(os.path.join(FIXTURES_DIR, 'kiev.xml'), 'rb') as f:
+            movies, showtimes = parse_with_iterparse(f)
+
+        self.assertEqual(movies[1]['title'], u'Бердмен')
+        self.assertIsNone(movies[1]['show_end'])
+        # Showtimes without order URL are left out, times are in UTC
+        self.assertEqual([showtime['id'] for showtime in showtimes],
+                         [50001, 50002, 50003, 50004, 50005])
+        self.assertEqual(str(showtimes[2]['date_time']),
+                         '2015-03-07 22:15:00')
+
+    def test_generated_feed(self):
+        self.assertSameRecords(make_feed(20, 5, 30))
+
+
+# Measures peak resident memory of parsing a feed file in a fresh process
+RSS_SCRIPT = """
+import io, resource, sys
+from tests.test_pk_parser import parse_with_iterparse, parse_with_xmltodict
+parser, path = sys.argv[1:]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if parser == 'iterparse':
+    with open(path, 'rb') as f:
+        parse_with_iterparse(f)
+else:
+    with io.open(path, encoding='utf-8') as f:
+        parse_with_xmltodict(f.read())
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(after - before)
+"""
+
+
+@pytest.fixture(scope='module')
+def large_feed(tmpdir_factory):
+    path = tmpdir_factory.mktemp('pk').join('feed.xml')
+    path.write_binary(make_feed(100, 30, 600))
+    return str(path)
+
+
+def peak_rss_growth(parser, path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output(
+        [sys.executable, '-c', RSS_SCRIPT, parser, path], cwd=root
+    )
+    return int(output)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'),
+                    reason='ru_maxrss is in kilobytes on Linux only')
+def test_peak_rss(large_feed):
+    iterparse_growth = peak_rss_growth('iterparse', large_feed)
+    xmltodict_growth = peak_rss_growth('xmltodict', large_feed)
+    sys.stdout.write('\nPeak RSS growth: iterparse {} KB, xmltodict {} KB\n'
+                     .format(iterparse_growth, xmltodict_growth))
+    # Parsed records are kept either way, the document tree is not
+    assert iterparse_growth < xmltodict_growth / 2
+
+
+@pytest.mark.benchmark(group='pk-parser')
+def test_benchmark_iterparse(benchmark, large_feed):
+    def parse():
+        with open(large_feed, 'rb') as f:
+            return parse_with_iterparse(f)
+    benchmark.pedantic(parse, rounds=3)
+
+
+@pytest.mark.benchmark(group='pk-parser')
+def test_benchmark_xmltodict(benchmark, large_feed):
+    def parse():
+        with io.open(large_feed, encoding='utf-8') as f:
+            return parse_with_xmltodict(f.read())
+    benchmark.pedantic(parse, rounds=3)
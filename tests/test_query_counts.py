@@ -0,0 +1,186 @@
+import copy
+import datetime
+import json
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from clapperboard import app
+from clapperboard.cache import ref_cache, data_version, user_cache
+from clapperboard.common.utils import FETCH_UPDATED
+from clapperboard.models import db
+from clapperboard.models.common.utils import count_queries
+from clapperboard.models.data_version import DataVersion
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.models.last_fetched import LastFetched
+from clapperboard.models.movie import Movie
+from clapperboard.models.show_time import ShowTime
+from clapperboard.models.technology import Technology
+from clapperboard.models.theatre import Theatre
+from clapperboard.models.user import User
+from clapperboard.workers import tasks
+
+
+class QueryCountTestCase(unittest.TestCase):
+    """
+    Number of SQL statements must not depend on the number of rows
+    handled, so every test runs with two data sets of different size.
+    """
+
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        self.reset()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def reset(self):
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        db.session.add(User('admin', 'admin@example.com', 'admin'))
+        for i in (1, 2):
+            theatre = Theatre('Theatre {}'.format(i), 'Theatre {}'.format(i),
+                              'theatre-{}'.format(i), 'pk-{}'.format(i))
+            theatre.id = i
+            db.session.add(theatre)
+            db.session.add(LastFetched(None, i))
+        db.session.add(Technology('2d', '2D'))
+        version = DataVersion(0, datetime.datetime.utcnow())
+        version.id = 1
+        db.session.add(version)
+        db.session.commit()
+        for cache in (ref_cache, data_version):
+            cache.invalidate()
+        tasks._snapshots['version'] = None
+
+    def add_movies(self, count, start=1):
+        now = datetime.datetime.utcnow()
+        for i in range(start, start + count):
+            imdb_data = IMDBData(i, 'Title {}'.format(i), 'Drama', 'USA',
+                                 'Director', 'Cast', 120, 7.0)
+            movie = Movie(i, 'Title {}'.format(i), 'title-{}'.format(i),
+                          now.date(), now.date())
+            movie.imdb_data = imdb_data
+            db.session.add(movie)
+            for theatre_id in (1, 2):
+                db.session.add(ShowTime(
+                    i * 10 + theatre_id, theatre_id, 1, 1,
+                    now + datetime.timedelta(hours=i),
+                    'https://example.com/order', i
+                ))
+        db.session.commit()
+
+    def get(self, url):
+        resp = self.client.post(
+            '/auth', data=json.dumps(dict(username='admin',
+                                          password='admin')),
+            content_type='application/json'
+        )
+        token = json.loads(resp.get_data(as_text=True))['token']
+        with count_queries(db.engine) as queries:
+            resp = self.client.get(
+                url, headers={'Authorization': 'Bearer {}'.format(token)}
+            )
+        self.assertEqual(resp.status_code, 200)
+        return queries.count
+
+    def assertQueryCount(self, count, url):
+        self.add_movies(2)
+        self.assertEqual(self.get(url), count)
+        self.add_movies(20, start=3)
+        self.assertEqual(self.get(url), count)
+
+
+class ListAPIQueryCountTest(QueryCountTestCase):
+    # Every request loads the user, reads data version for validation and
+    # for the response cache key, and reloads theatres and technologies
+    # before building the body
+
+    def test_movies(self):
+        self.assertQueryCount(6, '/movies')
+
+    def test_movies_expanded(self):
+        # Plus IMDB data and showtimes of the page
+        self.assertQueryCount(
+            8, '/movies?expand=imdb_data,showtimes,theatre,technology'
+        )
+
+    def test_showtimes(self):
+        self.assertQueryCount(6, '/showtimes')
+
+    def test_showtimes_expanded(self):
+        # Theatres and technologies come from the reference cache
+        self.assertQueryCount(6, '/showtimes?expand=theatre,technology')
+
+
+class TaskQueryCountTest(QueryCountTestCase):
+    def pk_data(self, count):
+        now = datetime.datetime.utcnow().replace(microsecond=0)
+        movies = [
+            dict(id=i, title='Title {}'.format(i),
+                 url_code='title-{}'.format(i), show_start=now.date(),
+                 show_end=now.date())
+            for i in range(1, count + 1)
+        ]
+        showtimes = [
+            dict(id=i * 10 + theatre_id, theatre='pk-{}'.format(theatre_id),
+                 hall_id=1, technology='2d',
+                 date_time=now + datetime.timedelta(hours=i),
+                 order_url='https://example.com/order', movie_id=i)
+            for i in range(1, count + 1) for theatre_id in (1, 2)
+        ]
+        theatres = [
+            dict(id=theatre_id, en_name='Theatre {}'.format(theatre_id),
+                 url_code='theatre-{}'.format(theatre_id), last_fetched=now,
+                 etag=None, status=FETCH_UPDATED)
+            for theatre_id in (1, 2)
+        ]
+        return movies, showtimes, theatres
+
+    def fetch(self, pk_data):
+        # Fetched data is modified while it is written
+        pk_data = copy.deepcopy(pk_data)
+        with mock.patch.object(tasks, 'get_pk_data', return_value=pk_data), \
+                mock.patch.object(tasks, 'enrich_imdb_data'):
+            with count_queries(db.engine) as queries:
+                tasks.write_movie_data(False)
+        return queries.count
+
+    def enrich(self, movie_ids):
+        imdb_data = [
+            dict(id=i, title='Title {}'.format(i), genre='Drama',
+                 country='USA', director='Director', cast='Cast',
+                 runtime=120, rating=7.0)
+            for i in movie_ids
+        ]
+        with mock.patch.object(tasks.imdb_cache, 'get_many_movie_imdb_data',
+                               return_value=imdb_data), \
+                mock.patch.object(tasks, 'write_schedule_snapshots'):
+            with count_queries(db.engine) as queries:
+                tasks.enrich_imdb_data(movie_ids)
+        return queries.count
+
+    def test_write_movie_data(self):
+        for count in (2, 20):
+            self.reset()
+            pk_data = self.pk_data(count)
+            self.assertEqual(self.fetch(pk_data), 17)
+            # Nothing has changed
+            self.assertEqual(self.fetch(pk_data), 11)
+
+    def test_enrich_imdb_data(self):
+        for count in (2, 20):
+            self.reset()
+            self.fetch(self.pk_data(count))
+            movie_ids = list(range(1, count + 1))
+            self.assertEqual(self.enrich(movie_ids), 8)
+            # Nothing has changed
+            self.assertEqual(self.enrich(movie_ids), 1)
@@ -0,0 +1,101 @@
+import datetime
+import gzip
+import io
+import json
+import sys
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from clapperboard import app
+from clapperboard.models import db
+from clapperboard.models.show_time import ShowTime
+from clapperboard.resources.common.representations import dumps
+from clapperboard.resources.common.serializers import showtime_serializer
+from tests.utils import APITestCase
+
+
+class OutputJSONTest(APITestCase):
+    def setUp(self):
+        super(OutputJSONTest, self).setUp()
+        self.add_movies(5)
+
+    def test_compact(self):
+        resp = self.get('/showtimes')
+        body = resp.get_data(as_text=True)
+
+        self.assertEqual(resp.headers['Content-Type'], 'application/json')
+        self.assertNotIn('\n', body)
+        self.assertNotIn(', ', body)
+        self.assertNotIn('": ', body)
+
+    def test_pretty(self):
+        compact = self.get('/showtimes').get_data(as_text=True)
+        pretty = self.get('/showtimes?pretty=1').get_data(as_text=True)
+
+        self.assertIn('\n    "showtimes": [', pretty)
+        self.assertEqual(json.loads(pretty), json.loads(compact))
+        self.assertLess(len(compact), len(pretty))
+
+    def test_compressed(self):
+        plain = self.get('/showtimes')
+        with mock.patch.dict(app.config, COMPRESS_RESPONSES=True,
+                             COMPRESS_MIN_SIZE=100):
+            resp = self.get('/showtimes',
+                            headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', resp.headers['Vary'])
+        self.assertNotEqual(resp.headers['ETag'], plain.headers['ETag'])
+        data = gzip.GzipFile(fileobj=io.BytesIO(resp.get_data())).read()
+        self.assertEqual(data, plain.get_data())
+
+    def test_not_compressed(self):
+        with mock.patch.dict(app.config, COMPRESS_RESPONSES=True,
+                             COMPRESS_MIN_SIZE=10 ** 6):
+            resp = self.get('/showtimes',
+                            headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', resp.headers)
+
+        with mock.patch.dict(app.config, COMPRESS_RESPONSES=True,
+                             COMPRESS_MIN_SIZE=100):
+            resp = self.get('/showtimes')
+        self.assertNotIn('Content-Encoding', resp.headers)
+
+
+@pytest.fixture(scope='module')
+def showtimes_page():
+    """Body of a full page of /showtimes, 1000 showtimes."""
+    with app.app_context():
+        db.create_all()
+        start = datetime.datetime(2015, 3, 7, 10)
+        db.session.add_all(
+            ShowTime(i, i % 2 + 1, i % 10 + 1, 1,
+                     start + datetime.timedelta(minutes=i * 10),
+                     'https://cabinet.planeta-kino.com.ua/hall/'
+                     '?show_id={}&theatre_id=pk-kiev'.format(i), i % 50 + 1)
+            for i in range(1, 1001)
+        )
+        db.session.commit()
+        rows = db.session.query(*showtime_serializer.columns).all()
+        yield dict(showtime_serializer.dump(rows), next=None)
+        db.session.remove()
+        db.drop_all()
+
+
+def test_payload_size(showtimes_page):
+    compact = len(dumps(showtimes_page))
+    pretty = len(dumps(showtimes_page, pretty=True))
+    sys.stdout.write('\n/showtimes payload: compact {} bytes, indented {} '
+                     'bytes\n'.format(compact, pretty))
+    assert compact < pretty * 0.75
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+@pytest.mark.benchmark(group='output-json')
+def test_benchmark_dumps(benchmark, showtimes_page, pretty):
+    benchmark(dumps, showtimes_page, pretty=pretty)
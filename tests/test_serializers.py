@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pytest
+
+from clapperboard import app
+from clapperboard.models import db
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.models.movie import Movie
+from clapperboard.models.show_time import ShowTime
+from clapperboard.resources.common.representations import dumps
+from clapperboard.resources.common.schemas import (
+    MovieSchema,
+    IMDBDataSchema,
+    ShowTimeSchema
+)
+from clapperboard.resources.common.serializers import (
+    movie_serializer,
+    imdb_data_serializer,
+    showtime_serializer
+)
+from tests.utils import DatabaseTestCase
+
+
+def add_rows(count):
+    now = datetime.datetime(2015, 3, 1, 12, 30)
+    for i in range(1, count + 1):
+        # Every other row has its optional values missing
+        full = i % 2
+        imdb_data = IMDBData(
+            i, u'Title {}'.format(i), u'Drama' if full else None,
+            u'USA', u'Director', u'Cast' if full else None,
+            120 if full else None, 7.5 if full else None
+        )
+        movie = Movie(i, u'Назва {}'.format(i), u'title-{}'.format(i),
+                      now.date() if full else None, None)
+        movie.imdb_data = imdb_data
+        db.session.add(movie)
+        db.session.add(ShowTime(
+            i, 1, 1 if full else None, 1, now + datetime.timedelta(hours=i),
+            u'https://example.com/order/{}'.format(i) if full else None, i
+        ))
+    db.session.commit()
+
+
+class RowSerializerTest(DatabaseTestCase):
+    def assertSameOutput(self, serializer, schema_class, model):
+        rows = db.session.query(*serializer.columns).order_by(model.id).all()
+        objects = model.query.order_by(model.id).all()
+        expected = schema_class(many=True).dump(objects).data
+        output = serializer.dump(rows)
+        for pretty in (False, True):
+            self.assertEqual(dumps(output, pretty=pretty),
+                             dumps(expected, pretty=pretty))
+
+    def test_movie(self):
+        add_rows(4)
+        self.assertSameOutput(movie_serializer, MovieSchema, Movie)
+
+    def test_imdb_data(self):
+        add_rows(4)
+        self.assertSameOutput(imdb_data_serializer, IMDBDataSchema,
+                              IMDBData)
+
+    def test_showtime(self):
+        add_rows(4)
+        self.assertSameOutput(showtime_serializer, ShowTimeSchema, ShowTime)
+
+    def test_invalid_value(self):
+        add_rows(2)
+        ShowTime.query.get(1).order_url = u'not a url'
+        db.session.commit()
+        self.assertSameOutput(showtime_serializer, ShowTimeSchema, ShowTime)
+
+
+@pytest.fixture
+def showtime_rows():
+    with app.app_context():
+        db.create_all()
+        add_rows(1000)
+        yield (
+            db.session.query(*showtime_serializer.columns).all(),
+            ShowTime.query.all()
+        )
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.benchmark(group='showtime-serialization')
+def test_benchmark_row_serializer(benchmark, showtime_rows):
+    rows, _ = showtime_rows
+    benchmark(showtime_serializer.dump, rows)
+
+
+@pytest.mark.benchmark(group='showtime-serialization')
+def test_benchmark_schema(benchmark, showtime_rows):
+    _, objects = showtime_rows
+    benchmark(ShowTimeSchema(many=True).dump, objects)
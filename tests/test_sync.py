@@ -0,0 +1,173 @@
+import copy
+import datetime
+
+import pytest
+
+from clapperboard import app
+from clapperboard.cache import ref_cache
+from clapperboard.models import db
+from clapperboard.models.movie import Movie
+from clapperboard.models.show_time import ShowTime
+from clapperboard.models.technology import Technology
+from clapperboard.models.theatre import Theatre
+from clapperboard.workers.tasks import _sync_movies, _sync_showtimes
+from tests.utils import DatabaseTestCase
+
+
+START = datetime.datetime(2015, 3, 7, 10)
+ORDER_URL = 'https://cabinet.planeta-kino.com.ua/hall/?show_id={}&x=1'
+
+
+def add_reference_data(theatre_count):
+    for i in range(1, theatre_count + 1):
+        theatre = Theatre('Theatre {}'.format(i), 'Theatre {}'.format(i),
+                          'theatre-{}'.format(i), 'pk-{}'.format(i))
+        theatre.id = i
+        db.session.add(theatre)
+    for i, code in enumerate(('2d', '3d'), 1):
+        technology = Technology(code, code.upper())
+        technology.id = i
+        db.session.add(technology)
+    db.session.commit()
+    ref_cache.invalidate()
+
+
+def pk_showtime(st_id, theatre_id, hall_id=1, technology='2d', hours=0,
+                movie_id=1):
+    return dict(id=st_id, theatre='pk-{}'.format(theatre_id),
+                hall_id=hall_id, technology=technology,
+                date_time=START + datetime.timedelta(hours=hours),
+                order_url=ORDER_URL.format(st_id), movie_id=movie_id)
+
+
+def pk_movie(movie_id, title):
+    return dict(id=movie_id, title=title,
+                url_code='movie-{}'.format(movie_id),
+                show_start=START.date(), show_end=None)
+
+
+class SyncShowtimesTest(DatabaseTestCase):
+    def setUp(self):
+        super(SyncShowtimesTest, self).setUp()
+        add_reference_data(3)
+        # Theatre 3 is the one that fails to be fetched
+        _sync_showtimes([
+            pk_showtime(11, 1), pk_showtime(12, 1), pk_showtime(13, 1),
+            pk_showtime(21, 2), pk_showtime(22, 2),
+            pk_showtime(31, 3), pk_showtime(32, 3),
+        ], {1, 2, 3})
+
+    def showtimes(self):
+        return dict(
+            (st.id, (st.theatre_id, st.hall_id, st.technology_id,
+                     st.date_time))
+            for st in ShowTime.query
+        )
+
+    def test_sync(self):
+        before = self.showtimes()
+
+        changed = _sync_showtimes([
+            pk_showtime(11, 1),
+            pk_showtime(12, 1, hall_id=2),
+            pk_showtime(14, 1),
+            pk_showtime(21, 2, technology='3d'),
+            pk_showtime(22, 2, hours=1),
+            pk_showtime(23, 2),
+        ], {1, 2})
+
+        self.assertEqual(changed, 6)
+        self.assertEqual(self.showtimes(), {
+            11: (1, 1, 1, START),
+            12: (1, 2, 1, START),
+            14: (1, 1, 1, START),
+            21: (2, 1, 2, START),
+            22: (2, 1, 1, START + datetime.timedelta(hours=1)),
+            23: (2, 1, 1, START),
+            31: before[31],
+            32: before[32],
+        })
+
+    def test_unchanged(self):
+        changed = _sync_showtimes([
+            pk_showtime(11, 1), pk_showtime(12, 1), pk_showtime(13, 1),
+        ], {1})
+
+        self.assertEqual(changed, 0)
+        self.assertEqual(len(self.showtimes()), 7)
+
+    def test_theatre_without_showtimes(self):
+        # Theatre 2 has been fetched and has nothing scheduled anymore,
+        # theatre 1 and 3 have not been fetched
+        changed = _sync_showtimes([], {2})
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(sorted(self.showtimes()), [11, 12, 13, 31, 32])
+
+
+class SyncMoviesTest(DatabaseTestCase):
+    def test_sync(self):
+        self.assertEqual(
+            _sync_movies([pk_movie(1, u'One'), pk_movie(2, u'Two')]), 2
+        )
+
+        changed = _sync_movies([
+            pk_movie(1, u'One'), pk_movie(2, u'Two, renamed'),
+            pk_movie(3, u'Three')
+        ])
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(
+            [(movie.id, movie.title) for movie in
+             Movie.query.order_by(Movie.id)],
+            [(1, u'One'), (2, u'Two, renamed'), (3, u'Three')]
+        )
+        self.assertEqual(_sync_movies([pk_movie(1, u'One')]), 0)
+
+
+# Size of the database the sync is benchmarked on
+THEATRE_COUNT = 4
+SHOWTIME_COUNT = 100000
+
+
+@pytest.fixture
+def large_schedule():
+    per_theatre = SHOWTIME_COUNT // THEATRE_COUNT
+    showtimes = [
+        pk_showtime(theatre_id * per_theatre + i, theatre_id,
+                    hall_id=i % 10 + 1, hours=i % 500, movie_id=i % 50 + 1)
+        for theatre_id in range(1, THEATRE_COUNT + 1)
+        for i in range(per_theatre)
+    ]
+    with app.app_context():
+        db.create_all()
+        add_reference_data(THEATRE_COUNT)
+        _sync_showtimes(copy.deepcopy(showtimes),
+                        set(range(1, THEATRE_COUNT + 1)))
+        yield showtimes
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.benchmark(group='sync-showtimes')
+def test_benchmark_sync_showtimes(benchmark, large_schedule):
+    # Every theatre has been fetched, 1% of showtimes are gone, 1% changed
+    # and 1% new
+    fetched = []
+    for i, showtime in enumerate(large_schedule):
+        if i % 100 == 0:
+            continue
+        showtime = dict(showtime)
+        if i % 100 == 1:
+            showtime['hall_id'] += 1
+        elif i % 100 == 2:
+            fetched.append(dict(showtime, id=showtime['id'] + 10 ** 6))
+        fetched.append(showtime)
+
+    changed = benchmark.pedantic(
+        _sync_showtimes, args=(fetched, set(range(1, THEATRE_COUNT + 1))),
+        rounds=1
+    )
+
+    assert changed == SHOWTIME_COUNT * 3 // 100
+    assert ShowTime.query.count() == SHOWTIME_COUNT
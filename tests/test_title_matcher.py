@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import random
+import sys
+import time
+import unittest
+
+import pytest
+
+from clapperboard.common.title_matcher import TitleMatcher, normalize
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures', 'titles')
+# Share of PK titles in the fixture that must resolve to the expected IMDB
+# title, some of them can not be told from their transliteration
+MIN_ACCURACY = 0.9
+# Size of the index latency is measured on, about the number of titles of
+# the last IMDB_MATCH_YEARS years in IMDB datasets
+LARGE_INDEX_SIZE = 100000
+BATCH_SIZE = 100
+
+
+def read_tsv(name):
+    with io.open(os.path.join(FIXTURES_DIR, name + '.tsv'),
+                 encoding='utf-8') as f:
+        next(f)
+        return [line.rstrip(u'\n').split(u'\t') for line in f]
+
+
+def imdb_titles():
+    return [(int(imdb_id), title, int(year), int(votes))
+            for imdb_id, title, year, votes in read_tsv('imdb_titles')]
+
+
+def pk_titles():
+    return [(title, int(year), int(expected) if expected else None)
+            for title, year, expected in read_tsv('pk_titles')]
+
+
+def generated_titles(count):
+    """Titles made of random words, none of them similar to real ones."""
+    rng = random.Random(0)
+    syllables = [u'ka', u'lo', u'mer', u'vin', u'tus', u'dra', u'pel', u'zor',
+                 u'qui', u'bex', u'nal', u'sho', u'tri', u'gum', u'fay']
+    words = [u''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+             for _ in range(2000)]
+    return [
+        (10 ** 7 + i,
+         u' '.join(rng.choice(words) for _ in range(rng.randint(1, 4))),
+         rng.randint(2012, 2015), rng.randint(0, 10000))
+        for i in range(count)
+    ]
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize(u'The Theory of Everything'),
+                         u'theory of everything')
+        self.assertEqual(normalize(u'Fast & Furious 6'), u'fast furious 6')
+        self.assertEqual(normalize(u'Mission: Impossible - Rogue Nation'),
+                         u'mission impossible rogue nation')
+        self.assertEqual(normalize(u'Amélie'), u'amelie')
+
+    def test_transliteration(self):
+        self.assertEqual(normalize(u'Поводир'), u'povodyr')
+        self.assertEqual(normalize(u'Хайтарма'), u'khaytarma')
+        self.assertEqual(normalize(u'Зелена кофта'), u'zelena kofta')
+
+
+class TitleMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = TitleMatcher(imdb_titles())
+
+    def test_transliterated(self):
+        for title, year, imdb_id in ((u'Поводир', 2015, 3461252),
+                                     (u'Хайтарма', 2014, 2904680),
+                                     (u'Брат 2', 2000, 238883)):
+            match = self.matcher.match(title, year)
+            self.assertEqual(match.id, imdb_id)
+            self.assertGreaterEqual(match.confidence, 0.6)
+
+    def test_year(self):
+        self.assertEqual(self.matcher.match(u'Cinderella', 2015).id,
+                         1661199)
+        self.assertEqual(self.matcher.match(u'Cinderella', 1950).id, 42332)
+        self.assertEqual(self.matcher.match(u'godzilla', 1998).id, 120685)
+        # Shown the year after release
+        self.assertEqual(self.matcher.match(u'annie', 2015).id, 1823664)
+
+    def test_votes(self):
+        # Same title and year, the more popular one wins
+        self.assertEqual(self.matcher.match(u'paddington', 2015).id,
+                         3152624)
+
+    def test_no_match(self):
+        self.assertIsNone(self.matcher.match(u'nothing like it', 2015))
+        self.assertIsNone(self.matcher.match(u'', 2015))
+
+    def test_accuracy(self):
+        cases = pk_titles()
+        correct = sum(
+            1 for title, year, expected in cases
+            if getattr(self.matcher.match(title, year), 'id', None) ==
+            expected
+        )
+        accuracy = float(correct) / len(cases)
+        sys.stdout.write('\nTitle match accuracy: {}/{} ({:.0%})\n'.format(
+            correct, len(cases), accuracy
+        ))
+        self.assertGreaterEqual(accuracy, MIN_ACCURACY)
+
+
+@pytest.fixture(scope='module')
+def large_matcher():
+    return TitleMatcher(imdb_titles() + generated_titles(LARGE_INDEX_SIZE))
+
+
+@pytest.fixture(scope='module')
+def batch():
+    cases = pk_titles()
+    return [cases[i % len(cases)][:2] for i in range(BATCH_SIZE)]
+
+
+def test_accuracy_large_index(large_matcher, batch):
+    # Unrelated titles do not change the results
+    small_matcher = TitleMatcher(imdb_titles())
+    for title, year in batch:
+        assert (large_matcher.match(title, year) ==
+                small_matcher.match(title, year))
+
+
+def test_batch_latency(large_matcher, batch):
+    start = time.time()
+    for title, year in batch:
+        large_matcher.match(title, year)
+    elapsed = time.time() - start
+    sys.stdout.write('\n{} titles matched against {} in {:.1f} ms\n'.format(
+        len(batch), len(large_matcher), elapsed * 1000
+    ))
+    # Tens of milliseconds, with room for slow test machines
+    assert elapsed < 0.5
+
+
+@pytest.mark.benchmark(group='title-matcher')
+def test_benchmark_match_batch(benchmark, large_matcher, batch):
+    def match_batch():
+        return [large_matcher.match(title, year) for title, year in batch]
+    benchmark(match_batch)
+
+
+@pytest.mark.benchmark(group='title-matcher')
+def test_benchmark_build_index(benchmark):
+    candidates = imdb_titles() + generated_titles(LARGE_INDEX_SIZE)
+    benchmark.pedantic(TitleMatcher, args=(candidates,), rounds=1)
@@ -0,0 +1,163 @@
+import datetime
+import json
+import threading
+import time
+import unittest
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from clapperboard import app
+from clapperboard.cache import ref_cache, data_version
+from clapperboard.models import db
+from clapperboard.models.data_version import DataVersion
+from clapperboard.models.imdb_data import IMDBData
+from clapperboard.models.last_fetched import LastFetched
+from clapperboard.models.movie import Movie
+from clapperboard.models.show_time import ShowTime
+from clapperboard.models.technology import Technology
+from clapperboard.models.theatre import Theatre
+from clapperboard.models.user import User
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case running in an app context with empty tables."""
+
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+
+class APITestCase(DatabaseTestCase):
+    """
+    Test case with a user, two theatres and a technology, requesting the
+    API as that user.
+    """
+
+    def setUp(self):
+        super(APITestCase, self).setUp()
+        db.session.add(User('admin', 'admin@example.com', 'admin'))
+        for i in (1, 2):
+            theatre = Theatre('Theatre {}'.format(i), 'Theatre {}'.format(i),
+                              'theatre-{}'.format(i), 'pk-{}'.format(i))
+            theatre.id = i
+            db.session.add(theatre)
+            db.session.add(LastFetched(None, i))
+        db.session.add(Technology('2d', '2D'))
+        version = DataVersion(0, datetime.datetime.utcnow())
+        version.id = 1
+        db.session.add(version)
+        db.session.commit()
+        for cache in (ref_cache, data_version):
+            cache.invalidate()
+        self.client = app.test_client()
+        self._token = None
+
+    def add_movies(self, count, start=1):
+        """Add movies with IMDB data and a showtime in each theatre."""
+        now = datetime.datetime.utcnow()
+        for i in range(start, start + count):
+            imdb_data = IMDBData(i, 'Title {}'.format(i), 'Drama', 'USA',
+                                 'Director', 'Cast', 120, 7.0)
+            movie = Movie(i, 'Title {}'.format(i), 'title-{}'.format(i),
+                          now.date(), now.date())
+            movie.imdb_data = imdb_data
+            db.session.add(movie)
+            for theatre_id in (1, 2):
+                db.session.add(ShowTime(
+                    i * 10 + theatre_id, theatre_id, 1, 1,
+                    now + datetime.timedelta(hours=i),
+                    'https://example.com/order', i
+                ))
+        db.session.commit()
+
+    def request(self, method, url, headers=None, **kwargs):
+        if self._token is None:
+            resp = self.client.post(
+                '/auth', data=json.dumps(dict(username='admin',
+                                              password='admin')),
+                content_type='application/json'
+            )
+            self._token = json.loads(resp.get_data(as_text=True))['token']
+        headers = dict(headers or {})
+        headers['Authorization'] = 'Bearer {}'.format(self._token)
+        return self.client.open(url, method=method, headers=headers,
+                                **kwargs)
+
+    def get(self, url, headers=None):
+        return self.request('GET', url, headers=headers)
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """
+    Local HTTP server answering GET and POST requests with canned
+    responses.
+
+    `routes` maps request paths to tuples (status, headers, body, delay),
+    or to callables returning such a tuple, and the response is sent after
+    `delay` seconds. Unknown paths get 404. Path and time of every request
+    are recorded in `requests`.
+
+    Used as a context manager, it serves from a background thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, routes):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _StubHandler)
+        self.routes = routes
+        self.requests = []
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_port)
+
+    def __enter__(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out have closed the connection already
+        pass
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, don't let either wait
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.requests.append((self.path, time.time()))
+        route = self.server.routes.get(self.path, (404, {}, b'', 0))
+        if callable(route):
+            route = route()
+        status, headers, body, delay = route
+        time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        pass